@@ -60,8 +60,10 @@ def upgrade() -> None:
         ),
     )
 
-    # Ensure existing rows receive default preferences
-    op.execute(f"UPDATE users SET preferences = {DEFAULT_PREFERENCES_SQL}")
+    # No backfill UPDATE: adding a NOT NULL column with a constant default is a
+    # catalog-only change on PostgreSQL 11+, and existing rows already read the
+    # default. Rewriting every row would hold an exclusive lock for the whole
+    # table and flood the WAL.
 
     # Remove server default to avoid future implicit defaults managed by the application layer
     op.alter_column('users', 'preferences', server_default=None)
@@ -1,12 +1,14 @@
 """Redis helpers for chatbot caching and coordination."""
 from __future__ import annotations
 
-import hashlib
-import json
 import os
+import threading
 import time
 from typing import Any, Iterable
 
+import orjson
+import xxhash
+
 try:
     import redis
 except ImportError:  # pragma: no cover - dependency missing in some environments
@@ -15,6 +17,7 @@ except ImportError:  # pragma: no cover - dependency missing in some environment
 
 _redis_client: redis.Redis | None = None  # type: ignore[valid-type]
 _redis_unavailable = False
+_client_lock = threading.Lock()
 
 REDIS_URL = os.getenv("CHATBOT_REDIS_URL") or os.getenv("COSIM_REDIS_URL")
 QUERY_CACHE_TTL = int(os.getenv("CHATBOT_QUERY_CACHE_TTL", "3600"))
@@ -25,8 +28,22 @@ VECTOR_READY_TTL = int(os.getenv("CHATBOT_VECTOR_READY_TTL", "86400"))
 _QUERY_PREFIX = "chatbot:query"
 _HISTORY_PREFIX = "chatbot:history"
 _VECTOR_READY_KEY = "chatbot:vector:ready"
+_VECTOR_READY_CHANNEL = "chatbot:vector:ready"
 _WARMUP_LOCK_KEY = "chatbot:vector:warmup"
 
+# SET ... GET refreshes the TTL and reports the prior state; only the first mark
+# publishes, and both happen in one round-trip.
+_MARK_VECTOR_READY_LUA = """
+local previous = redis.call('SET', KEYS[1], '1', 'EX', ARGV[1], 'GET')
+if previous then
+    return 1
+end
+redis.call('PUBLISH', ARGV[2], '1')
+return 0
+"""
+
+_mark_vector_ready_script = None
+
 
 def set_redis_client(client: redis.Redis | None) -> None:  # type: ignore[valid-type]
     global _redis_client, _redis_unavailable
@@ -35,25 +52,35 @@ def set_redis_client(client: redis.Redis | None) -> None:  # type: ignore[valid-
 
 
 def get_client() -> redis.Redis | None:  # type: ignore[valid-type]
+    client = _redis_client
+    if client is not None or _redis_unavailable:
+        return client
+    return _connect()
+
+
+def _connect() -> redis.Redis | None:  # type: ignore[valid-type]
     global _redis_client, _redis_unavailable
-    if _redis_client or _redis_unavailable:
-        return _redis_client
-    if redis is None or not REDIS_URL:
-        _redis_unavailable = True
-        return None
-    try:
-        client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
-        client.ping()
-        _redis_client = client
-        return _redis_client
-    except Exception as exc:  # pragma: no cover - network issues
-        print(f"⚠️  Chatbot Redis unavailable: {exc}")
-        _redis_unavailable = True
-        return None
+    # Double-checked so concurrent first callers share a single connect + ping.
+    with _client_lock:
+        if _redis_client is not None or _redis_unavailable:
+            return _redis_client
+        if redis is None or not REDIS_URL:
+            _redis_unavailable = True
+            return None
+        try:
+            client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+            client.ping()
+            _redis_client = client
+            return _redis_client
+        except Exception as exc:  # pragma: no cover - network issues
+            print(f"⚠️  Chatbot Redis unavailable: {exc}")
+            _redis_unavailable = True
+            return None
 
 
 def _hash_identifier(value: str) -> str:
-    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+    # Cache keys only need to be well distributed, not collision resistant.
+    return xxhash.xxh3_128_hexdigest(value.encode("utf-8"))
 
 
 def cache_query_results(query: str, n_results: int, results: list[dict[str, Any]]) -> None:
@@ -63,7 +90,7 @@ def cache_query_results(query: str, n_results: int, results: list[dict[str, Any]
     identifier = f"{query}:{n_results}"
     key = f"{_QUERY_PREFIX}:{_hash_identifier(identifier)}"
     try:
-        client.setex(key, QUERY_CACHE_TTL, json.dumps(results))
+        client.set(key, orjson.dumps(results), ex=QUERY_CACHE_TTL)
     except Exception as exc:  # pragma: no cover - network issues
         print(f"⚠️  Failed to cache query: {exc}")
 
@@ -78,8 +105,8 @@ def get_cached_query_results(query: str, n_results: int) -> list[dict[str, Any]]
     if not payload:
         return None
     try:
-        return json.loads(payload)
-    except json.JSONDecodeError:
+        return orjson.loads(payload)
+    except orjson.JSONDecodeError:
         client.delete(key)
         return None
 
@@ -93,9 +120,11 @@ def append_history(conversation_id: str, message: dict[str, Any], *, max_items:
     key = f"{_HISTORY_PREFIX}:{conversation_id}"
     limit = max_items or HISTORY_MAX
     try:
-        client.rpush(key, json.dumps(message))
-        client.ltrim(key, -limit, -1)
-        client.expire(key, HISTORY_TTL)
+        pipe = client.pipeline(transaction=False)
+        pipe.rpush(key, orjson.dumps(message))
+        pipe.ltrim(key, -limit, -1)
+        pipe.expire(key, HISTORY_TTL)
+        pipe.execute()
     except Exception as exc:  # pragma: no cover
         print(f"⚠️  Failed to append conversation history: {exc}")
 
@@ -108,11 +137,18 @@ def fetch_history(conversation_id: str, limit: int) -> list[dict[str, Any]]:
     key = f"{_HISTORY_PREFIX}:{conversation_id}"
     try:
         entries = client.lrange(key, -limit, -1)
+        if not entries:
+            return []
+        try:
+            return orjson.loads("[" + ",".join(entries) + "]")
+        except orjson.JSONDecodeError:
+            pass
+        # A corrupt entry poisons the batched decode; fall back to skipping it.
         history: list[dict[str, Any]] = []
         for entry in entries:
             try:
-                history.append(json.loads(entry))
-            except json.JSONDecodeError:
+                history.append(orjson.loads(entry))
+            except orjson.JSONDecodeError:
                 continue
         return history
     except Exception as exc:  # pragma: no cover
@@ -136,10 +172,25 @@ def release_warmup_lock() -> None:
         client.delete(_WARMUP_LOCK_KEY)
 
 
-def mark_vector_ready() -> None:
+def mark_vector_ready() -> bool:
+    """Set the ready flag and wake waiters; returns True if it was already set."""
     client = get_client()
-    if client:
-        client.set(_VECTOR_READY_KEY, "1", ex=VECTOR_READY_TTL)
+    if not client:
+        return False
+    # Restarts that find the flag already set skip the publish.
+    previous = _get_mark_vector_ready_script(client)(
+        keys=[_VECTOR_READY_KEY],
+        args=[VECTOR_READY_TTL, _VECTOR_READY_CHANNEL],
+        client=client,
+    )
+    return bool(previous)
+
+
+def _get_mark_vector_ready_script(client: redis.Redis):  # type: ignore[valid-type]
+    global _mark_vector_ready_script
+    if _mark_vector_ready_script is None:
+        _mark_vector_ready_script = client.register_script(_MARK_VECTOR_READY_LUA)
+    return _mark_vector_ready_script
 
 
 def is_vector_ready() -> bool:
@@ -149,16 +200,24 @@ def is_vector_ready() -> bool:
     return bool(client.exists(_VECTOR_READY_KEY))
 
 
-def wait_for_vector_ready(timeout: int = 120) -> bool:
+def wait_for_vector_ready(timeout: float = 120) -> bool:
     client = get_client()
     if not client:
         return False
-    end_time = time.time() + timeout
-    while time.time() < end_time:
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    try:
+        # Subscribe before checking the key so a concurrent mark_vector_ready
+        # cannot slip in between the check and the wait.
+        pubsub.subscribe(_VECTOR_READY_CHANNEL)
         if client.exists(_VECTOR_READY_KEY):
             return True
-        time.sleep(1)
-    return False
+        end_time = time.monotonic() + timeout
+        while (remaining := end_time - time.monotonic()) > 0:
+            if pubsub.get_message(timeout=remaining):
+                return True
+        return False
+    finally:
+        pubsub.close()
 
 
 def reset_state() -> None:
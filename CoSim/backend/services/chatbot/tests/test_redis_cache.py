@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+
 import pytest
 from datetime import datetime
 
@@ -15,6 +17,7 @@ from redis_cache import (
     release_warmup_lock,
     reset_state,
     set_redis_client,
+    wait_for_vector_ready,
 )
 
 
@@ -45,9 +48,37 @@ def test_history_persistence(_redis_client):
     assert history[1]["role"] == "assistant"
 
 
+def test_history_skips_corrupt_entries(_redis_client):
+    conversation_id = "conv-2"
+    append_history(conversation_id, {"role": "user", "content": "hi"})
+    _redis_client.rpush(f"chatbot:history:{conversation_id}", "{not json")
+    append_history(conversation_id, {"role": "assistant", "content": "hello"})
+    history = fetch_history(conversation_id, limit=5)
+    assert [entry["role"] for entry in history] == ["user", "assistant"]
+
+
 def test_warmup_lock_only_allows_single_holder():
     assert acquire_warmup_lock(ttl=1)
     assert not acquire_warmup_lock(ttl=1)
     release_warmup_lock()
     assert acquire_warmup_lock(ttl=1)
     mark_vector_ready()
+
+
+def test_wait_for_vector_ready_wakes_on_publish():
+    timer = threading.Timer(0.1, mark_vector_ready)
+    timer.start()
+    try:
+        assert wait_for_vector_ready(timeout=5)
+    finally:
+        timer.join()
+    assert wait_for_vector_ready(timeout=0)
+
+
+def test_wait_for_vector_ready_times_out():
+    assert not wait_for_vector_ready(timeout=0.2)
+
+
+def test_mark_vector_ready_reports_prior_state():
+    assert mark_vector_ready() is False
+    assert mark_vector_ready() is True
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-import json as jsonlib
+import time
+from collections import OrderedDict
 from collections.abc import Mapping
 from typing import Any
 
 import httpx
+import orjson
 from fastapi import HTTPException, Request, status
 
 from co_sim.core.config import settings
-from co_sim.core.redis import build_cache_identifier, cache_get, cache_set
+from co_sim.core.redis import build_cache_identifier, cache_get_bytes, cache_set
 
 SERVICE_MAP = {
     "auth": settings.service_endpoints.auth_base_url.rstrip("/"),
@@ -18,7 +20,44 @@ SERVICE_MAP = {
     "simulation": settings.service_endpoints.simulation_base_url.rstrip("/"),
 }
 
-CACHE_NAMESPACE = "api-gateway"
+# Bound lookup over configured services only; unknown or blank entries raise KeyError.
+_resolve_base_url = {key: url for key, url in SERVICE_MAP.items() if url}.__getitem__
+
+# Versioned with the payload layout ("<metadata json>\n<raw body>") so pods on
+# different releases never read each other's entries during a rollout.
+CACHE_NAMESPACE = "api-gateway:v2"
+# Request headers passed through to upstream services (Starlette lookups are case-insensitive).
+_FORWARDED_HEADERS = ("authorization", "x-request-id", "content-type")
+LOCAL_CACHE_MAX_ENTRIES = 4096
+
+CachedResponse = tuple[int, bytes, dict[str, str]]
+
+# Process-local L1 in front of Redis: identifier -> (expires_at, cached response).
+_local_cache: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared upstream client, creating it on first use."""
+
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared upstream client if it exists."""
+
+    global _http_client
+    if _http_client is None:
+        return
+    await _http_client.aclose()
+    _http_client = None
 
 
 async def forward_request(
@@ -31,39 +70,37 @@ async def forward_request(
     content: Any | None = None,
 ) -> httpx.Response:
     method_upper = method.upper()
-    base_url = SERVICE_MAP.get(service_key)
-    if not base_url:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Service not configured")
+    try:
+        base_url = _resolve_base_url(service_key)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Service not configured"
+        ) from None
 
-    headers = {
-        key: value
-        for key, value in request.headers.items()
-        if key.lower() in {"authorization", "x-request-id", "content-type"}
-    }
+    request_headers = request.headers
+    headers = {name: value for name in _FORWARDED_HEADERS if (value := request_headers.get(name))}
 
     cache_identifier: str | None = None
     use_cache = method_upper == "GET" and settings.api_cache_ttl_seconds > 0
     if use_cache:
-        cache_identifier = build_cache_identifier(
-            service_key,
-            path,
-            jsonlib.dumps(params or {}, sort_keys=True),
-            headers.get("authorization", ""),
-        )
-        cached_payload = await cache_get(CACHE_NAMESPACE, cache_identifier)
+        cache_identifier = _cache_identifier(service_key, path, params, headers.get("authorization", ""))
+        cached = _local_cache_get(cache_identifier)
+        if cached is not None:
+            return _build_cached_response(cached)
+        cached_payload = await cache_get_bytes(CACHE_NAMESPACE, cache_identifier)
         if cached_payload:
-            cached_response = _build_cached_response(cached_payload)
-            return cached_response
-
-    async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
-        response = await client.request(
-            method=method_upper,
-            url=f"{base_url}{path}",
-            json=json,
-            params=params,
-            headers=headers,
-            content=content,
-        )
+            cached = _decode_cached_payload(cached_payload)
+            _local_cache_put(cache_identifier, cached)
+            return _build_cached_response(cached)
+
+    response = await get_http_client().request(
+        method=method_upper,
+        url=f"{base_url}{path}",
+        json=json,
+        params=params,
+        headers=headers,
+        content=content,
+    )
 
     if response.status_code >= 400:
         try:
@@ -77,13 +114,52 @@ async def forward_request(
     return response
 
 
-def _build_cached_response(payload: str) -> httpx.Response:
-    data = jsonlib.loads(payload)
-    response = httpx.Response(
-        status_code=data["status"],
-        content=data["body"].encode("utf-8"),
-        headers=data.get("headers") or {},
-    )
+def _cache_identifier(
+    service_key: str,
+    path: str,
+    params: Mapping[str, Any] | None,
+    authorization: str,
+) -> str:
+    return build_cache_identifier(service_key, path, _params_cache_key(params), authorization)
+
+
+def _params_cache_key(params: Mapping[str, Any] | None) -> bytes:
+    if not params:
+        return b"{}"
+    if not isinstance(params, dict):
+        params = dict(params)
+    return orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+
+
+def _local_cache_get(identifier: str) -> CachedResponse | None:
+    entry = _local_cache.get(identifier)
+    if entry is None:
+        return None
+    expires_at, cached = entry
+    if expires_at <= time.monotonic():
+        _local_cache.pop(identifier, None)
+        return None
+    _local_cache.move_to_end(identifier)
+    return cached
+
+
+def _local_cache_put(identifier: str, cached: CachedResponse) -> None:
+    _local_cache[identifier] = (time.monotonic() + settings.api_cache_ttl_seconds, cached)
+    _local_cache.move_to_end(identifier)
+    while len(_local_cache) > LOCAL_CACHE_MAX_ENTRIES:
+        _local_cache.popitem(last=False)
+
+
+def _decode_cached_payload(payload: bytes) -> CachedResponse:
+    # Payload layout: "<metadata json>\n<raw body>"; only the metadata is parsed.
+    meta, _, body = payload.partition(b"\n")
+    data = orjson.loads(meta)
+    return data["status"], body, data.get("headers") or {}
+
+
+def _build_cached_response(cached: CachedResponse) -> httpx.Response:
+    status_code, body, headers = cached
+    response = httpx.Response(status_code=status_code, content=body, headers=headers)
     response.headers["X-Cache"] = "HIT"
     return response
 
@@ -91,13 +167,8 @@ def _build_cached_response(payload: str) -> httpx.Response:
 async def _store_in_cache(identifier: str, response: httpx.Response) -> None:
     if response.status_code != 200:
         return
-    payload = jsonlib.dumps(
-        {
-            "status": response.status_code,
-            "body": response.text,
-            "headers": {
-                "content-type": response.headers.get("content-type", "application/json"),
-            },
-        }
-    )
+    headers = {"content-type": response.headers.get("content-type", "application/json")}
+    meta = orjson.dumps({"status": response.status_code, "headers": headers})
+    payload = meta + b"\n" + response.content
     await cache_set(CACHE_NAMESPACE, identifier, payload, settings.api_cache_ttl_seconds)
+    _local_cache_put(identifier, (response.status_code, response.content, headers))
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import math
+import time
+
 try:  # Python 3.8 compatibility
     from typing import Annotated
 except ImportError:  # pragma: no cover
@@ -7,12 +10,32 @@ except ImportError:  # pragma: no cover
 
 from fastapi import Depends, HTTPException, Request, status
 from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
 
 from co_sim.core.config import settings
 from co_sim.core.redis import redis_dependency
 from co_sim.typing import Annotated
 
 RATE_LIMIT_PREFIX = "api-gateway:rate"
+RATE_LIMIT_WINDOW_SECONDS = 60
+_BLOCKED_CACHE_MAX_ENTRIES = 10_000
+
+# Increment the window counter, start the window on the first hit, and report
+# the remaining block time in one round-trip: returns {allowed, retry_after_ms}.
+_RATE_LIMIT_LUA = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+if current > tonumber(ARGV[2]) then
+    return {0, redis.call('PTTL', KEYS[1])}
+end
+return {1, 0}
+"""
+
+_rate_limit_script: AsyncScript | None = None
+# identifier -> monotonic deadline; lets flood traffic short-circuit before Redis.
+_blocked_until: dict[str, float] = {}
 
 
 async def enforce_rate_limit(
@@ -24,27 +47,56 @@ async def enforce_rate_limit(
         return
 
     identifier = _extract_identifier(request)
+    now = time.monotonic()
+    blocked_until = _blocked_until.get(identifier)
+    if blocked_until is not None:
+        if blocked_until > now:
+            _raise_rate_limited(blocked_until - now)
+        del _blocked_until[identifier]
+
     key = f"{RATE_LIMIT_PREFIX}:{identifier}"
+    allowed, retry_after_ms = await _get_rate_limit_script(redis)(
+        keys=[key],
+        args=[RATE_LIMIT_WINDOW_SECONDS, limit],
+        client=redis,
+    )
+    if not allowed:
+        retry_after = max(int(retry_after_ms), 0) / 1000
+        _remember_blocked(identifier, now + retry_after)
+        _raise_rate_limited(retry_after)
+
+
+def _get_rate_limit_script(redis: Redis) -> AsyncScript:
+    global _rate_limit_script
+    if _rate_limit_script is None:
+        _rate_limit_script = redis.register_script(_RATE_LIMIT_LUA)
+    return _rate_limit_script
+
+
+def _remember_blocked(identifier: str, deadline: float) -> None:
+    if len(_blocked_until) >= _BLOCKED_CACHE_MAX_ENTRIES:
+        now = time.monotonic()
+        for stale in [key for key, until in _blocked_until.items() if until <= now]:
+            del _blocked_until[stale]
+        if len(_blocked_until) >= _BLOCKED_CACHE_MAX_ENTRIES:
+            return
+    _blocked_until[identifier] = deadline
 
-    current = await redis.incr(key)
-    if current == 1:
-        await redis.expire(key, 60)
 
-    if current > limit:
-        retry_after = await redis.ttl(key)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail={
-                "message": "Rate limit exceeded",
-                "retry_after": max(retry_after, 0),
-            },
-        )
+def _raise_rate_limited(retry_after: float) -> None:
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={
+            "message": "Rate limit exceeded",
+            "retry_after": max(math.ceil(retry_after), 0),
+        },
+    )
 
 
 def _extract_identifier(request: Request) -> str:
     forwarded_for = request.headers.get("x-forwarded-for")
     if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
+        return forwarded_for.partition(",")[0].strip()
     client = request.client
     if client and client.host:
         return client.host
@@ -4,6 +4,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from co_sim.agents.api_gateway.client import close_http_client, get_http_client
 from co_sim.agents.api_gateway.routes import router as gateway_router
 from co_sim.core import logging as logging_config
 from co_sim.core.config import settings
@@ -14,9 +15,11 @@ from co_sim.core.redis import close_redis, init_redis
 async def lifespan(app: FastAPI):
     logging_config.configure_logging()
     await init_redis()
+    get_http_client()
     try:
         yield
     finally:
+        await close_http_client()
         await close_redis()
 
 
@@ -200,7 +200,13 @@ async def gateway_delete_workspace(request: Request, workspace_id: str) -> Any:
 
 @router.get("/workspaces/{workspace_id}/files")
 async def gateway_list_workspace_files(request: Request, workspace_id: str) -> Any:
-    response = await forward_request(request, "project", f"/v1/workspaces/{workspace_id}/files", method="GET")
+    response = await forward_request(
+        request,
+        "project",
+        f"/v1/workspaces/{workspace_id}/files",
+        method="GET",
+        params=dict(request.query_params),
+    )
     return response.json()
 
 
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import codecs
 import logging
 from contextlib import asynccontextmanager
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 
 from co_sim.api.v1.routes import sessions
@@ -12,12 +13,24 @@ from co_sim.core import logging as logging_config
 from co_sim.core.redis import close_redis, init_redis
 from co_sim.services.terminal import (
     TerminalManager,
+    TerminalSession,
     persist_terminal_state,
     remove_terminal_state,
 )
 
 logger = logging.getLogger(__name__)
 
+# Output bursts (builds, logs) are merged into frames of up to this size.
+_OUTPUT_FRAME_MAX_BYTES = 64 * 1024
+# Reads at least this large are treated as a burst and briefly lingered on;
+# smaller reads (keystroke echo) are sent immediately.
+_OUTPUT_BURST_THRESHOLD = 4096
+_OUTPUT_COALESCE_WINDOW = 0.005
+
+# Fixed error payloads are encoded once. They go out as text frames because
+# binary-mode clients treat every binary frame as PTY output.
+_ERROR_INVALID_JSON = orjson.dumps({"type": "error", "message": "Invalid JSON"}).decode()
+
 # Shared terminal manager
 _terminal_manager = TerminalManager()
 
@@ -54,8 +67,12 @@ def create_app() -> FastAPI:
             Server → Client:
                 {"type": "output", "data": "<text>"}     — PTY stdout
                 {"type": "error", "message": "<text>"}   — error info
+
+        Connecting with ``?encoding=binary`` sends PTY stdout as raw binary
+        frames instead of ``output`` messages; errors remain JSON text.
         """
         await websocket.accept()
+        binary_output = websocket.query_params.get("encoding") == "binary"
 
         try:
             ts = await _terminal_manager.get_or_create(session_id)
@@ -64,13 +81,18 @@ def create_app() -> FastAPI:
 
             # Background reader: forward PTY output → WebSocket
             async def _reader():
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
                 try:
                     while ts.is_alive:
-                        output = await ts.read(4096)
-                        if output:
-                            await websocket.send_json({"type": "output", "data": output})
+                        output = await ts.read_bytes(_OUTPUT_FRAME_MAX_BYTES)
+                        if not output:
+                            break  # PTY closed
+                        if len(output) >= _OUTPUT_BURST_THRESHOLD:
+                            output += await _drain_burst(ts, _OUTPUT_FRAME_MAX_BYTES - len(output))
+                        if binary_output:
+                            await websocket.send_bytes(output)
                         else:
-                            await asyncio.sleep(0.05)
+                            await websocket.send_json({"type": "output", "data": decoder.decode(output)})
                 except Exception:
                     pass  # WebSocket closed or PTY died
 
@@ -78,11 +100,15 @@ def create_app() -> FastAPI:
 
             # Main loop: read client messages
             while True:
-                raw = await websocket.receive_text()
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                # Accept control messages in text or binary frames alike.
+                raw = message.get("text") or message.get("bytes") or b""
                 try:
-                    msg = json.loads(raw)
-                except json.JSONDecodeError:
-                    await websocket.send_json({"type": "error", "message": "Invalid JSON"})
+                    msg = orjson.loads(raw)
+                except orjson.JSONDecodeError:
+                    await websocket.send_text(_ERROR_INVALID_JSON)
                     continue
 
                 msg_type = msg.get("type")
@@ -100,7 +126,9 @@ def create_app() -> FastAPI:
                     await ts.interrupt()
 
                 else:
-                    await websocket.send_json({"type": "error", "message": f"Unknown type: {msg_type}"})
+                    await websocket.send_text(
+                        orjson.dumps({"type": "error", "message": f"Unknown type: {msg_type}"}).decode()
+                    )
 
         except WebSocketDisconnect:
             logger.info("Terminal WS disconnected: %s", session_id)
@@ -119,4 +147,16 @@ def create_app() -> FastAPI:
     return app
 
 
+async def _drain_burst(ts: TerminalSession, budget: int) -> bytes:
+    """Collect output that follows a burst within the coalescing window."""
+    chunks: list[bytes] = []
+    while budget > 0:
+        chunk = await ts.read_bytes(budget, timeout=_OUTPUT_COALESCE_WINDOW)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        budget -= len(chunk)
+    return b"".join(chunks)
+
+
 app = create_app()
@@ -0,0 +1,13 @@
+"""Shared interface for the engine-specific stream managers."""
+
+
+class NotSupportedError(Exception):
+    """Raised when an engine does not implement an optional capability."""
+
+
+class SimulationManager:
+    """Base class for stream managers; optional capabilities raise NotSupportedError."""
+
+    def set_camera(self, distance: float, yaw: float, pitch: float, target: list) -> None:
+        """Update the render camera."""
+        raise NotSupportedError("Camera control not supported for this engine")
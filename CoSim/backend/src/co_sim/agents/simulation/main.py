@@ -1,18 +1,28 @@
 """Simulation Agent - Main FastAPI application for MuJoCo/PyBullet simulation."""
 import asyncio
+import io
 import logging
-from contextlib import asynccontextmanager
-from dataclasses import dataclass
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager, suppress
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+import numpy as np
+import orjson
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 
+from co_sim.agents.simulation.base import NotSupportedError
 from co_sim.agents.simulation.mujoco_env import MuJoCoStreamManager, MUJOCO_AVAILABLE
 from co_sim.agents.simulation.pybullet_env import PyBulletStreamManager, PYBULLET_AVAILABLE
-from co_sim.agents.simulation.session_tracker import get_active_sessions, handle_session_event
-from co_sim.agents.simulation.webrtc import WebRTCBroadcaster
+from co_sim.agents.simulation.session_tracker import get_active_sessions_json, handle_session_event
+from co_sim.agents.simulation.webrtc import WebRTCBroadcaster, use_hardware_encoder
 from co_sim.core.config import settings
 from co_sim.core.redis import close_redis, init_redis
 from co_sim.services import session_events, simulation_state
@@ -24,33 +34,92 @@ class SimulationRuntime:
     manager: Any
     webrtc: WebRTCBroadcaster | None = None
     webrtc_peer_count: int = 0
-    frame_callback: Any | None = None
-    state_callback: Any | None = None
+    local_subscribers: list[asyncio.Queue[bytes]] = field(default_factory=list)
+    local_subscriber_count: int = 0
+    last_state_persist_ts: float = 0.0
+    persisted_streaming: bool | None = None
+    # Globals shared by /execute calls on this session, so variables persist like a notebook kernel.
+    exec_context: dict[str, Any] | None = None
+    # /execute calls on one session share exec_context, so they run one at a time.
+    exec_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    async def on_frame(
+        self,
+        frame_bytes: bytes,
+        state: Dict[str, Any],
+        pixels: np.ndarray | None = None,
+    ) -> None:
+        """Per-tick callback for the stream manager: fan out the frame, mirror state."""
+        if frame_bytes:
+            for queue in self.local_subscribers:
+                _offer_frame(queue, frame_bytes)
+        # webrtc_peer_count mirrors the broadcaster via its on_peer_count callback.
+        if self.webrtc_peer_count:
+            # Raw pixels skip decoding the JPEG we just encoded.
+            if pixels is not None:
+                await self.webrtc.publish_pixels(pixels)
+            elif frame_bytes:
+                await self.webrtc.publish_frame(frame_bytes)
+        relay = frame_bytes if frame_bytes and settings.multi_process and self.local_subscriber_count else None
+
+        session_id = self.config.session_id
+        streaming = self.manager.is_streaming
+        now = time.monotonic()
+        # Throttle to a few Hz, but always record a streaming on/off transition.
+        if streaming == self.persisted_streaming and now - self.last_state_persist_ts < _STATE_PERSIST_INTERVAL:
+            if relay:
+                await simulation_state.publish_frame(session_id, relay)
+            return
+        self.last_state_persist_ts = now
+        self.persisted_streaming = streaming
+        if relay:
+            # The relayed frame rides along with the state write in one pipeline.
+            await simulation_state.publish_frame_and_state(
+                session_id, relay, state, status="streaming", streaming=streaming
+            )
+        else:
+            await _persist_state(session_id, state, status="streaming", streaming=streaming)
+
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Global simulation managers
 simulations: Dict[str, SimulationRuntime] = {}
-_stream_subscribers: Dict[str, int] = {}
-_subscriber_lock = asyncio.Lock()
+# Configs are immutable once persisted, so Redis is only consulted on a miss.
+_config_cache: Dict[str, simulation_state.SimulationConfig] = {}
+
+# Frames are video: a slow WebSocket keeps only the newest few.
+_FRAME_QUEUE_MAXSIZE = 2
+# Streaming telemetry is mirrored to Redis at most this often (seconds).
+_STATE_PERSIST_INTERVAL = 0.1
+
+
+# The counters are only touched from the event loop and never await, so no lock is needed.
+def _increment_subscribers(runtime: SimulationRuntime) -> int:
+    runtime.local_subscriber_count += 1
+    return runtime.local_subscriber_count
+
 
+def _decrement_subscribers(runtime: SimulationRuntime) -> int:
+    runtime.local_subscriber_count = max(runtime.local_subscriber_count - 1, 0)
+    return runtime.local_subscriber_count
 
-async def _increment_subscribers(session_id: str) -> int:
-    async with _subscriber_lock:
-        count = _stream_subscribers.get(session_id, 0) + 1
-        _stream_subscribers[session_id] = count
-        return count
 
+async def _get_config_cached(session_id: str) -> simulation_state.SimulationConfig | None:
+    config = _config_cache.get(session_id)
+    if config is None:
+        config = await simulation_state.get_config(session_id)
+        if config is not None:
+            _config_cache[session_id] = config
+    return config
 
-async def _decrement_subscribers(session_id: str) -> int:
-    async with _subscriber_lock:
-        count = _stream_subscribers.get(session_id, 0) - 1
-        if count <= 0:
-            _stream_subscribers.pop(session_id, None)
-            return 0
-        _stream_subscribers[session_id] = count
-        return count
+
+def _handle_session_event(event: dict) -> None:
+    handle_session_event(event)
+    session = event.get("session") or {}
+    if session.get("status") == "terminated":
+        _config_cache.pop(str(session.get("id")), None)
 
 
 def _create_manager(config: simulation_state.SimulationConfig):
@@ -92,46 +161,39 @@ async def _persist_state(session_id: str, state: dict, *, status: str, streaming
     )
 
 
-def _active_subscribers(session_id: str) -> int:
-    return _stream_subscribers.get(session_id, 0)
-
-
-def _build_frame_callback(session_id: str, runtime: SimulationRuntime):
-    async def frame_callback(frame_bytes: bytes) -> None:
-        if _active_subscribers(session_id) > 0:
-            await simulation_state.publish_frame(session_id, frame_bytes)
-        if runtime.webrtc and runtime.webrtc.peer_count > 0:
-            await runtime.webrtc.publish_frame(frame_bytes)
-
-    return frame_callback
-
+def _offer_frame(queue: asyncio.Queue[bytes], frame_bytes: bytes) -> None:
+    if queue.full():
+        queue.get_nowait()  # drop the oldest frame rather than stall the producer
+    queue.put_nowait(frame_bytes)
 
-def _build_state_callback(session_id: str, runtime: SimulationRuntime):
-    async def state_callback(state: Dict[str, Any]) -> None:
-        await _persist_state(session_id, state, status="streaming", streaming=runtime.manager.is_streaming)
 
-    return state_callback
+def _latest_frame(queue: asyncio.Queue[bytes], frame_bytes: bytes) -> bytes:
+    # Frames that piled up while the previous send was in flight are stale.
+    while not queue.empty():
+        frame_bytes = queue.get_nowait()
+    return frame_bytes
 
 
 async def _update_streaming(session_id: str, runtime: SimulationRuntime) -> None:
-    should_stream = _active_subscribers(session_id) > 0 or runtime.webrtc_peer_count > 0
+    should_stream = runtime.local_subscriber_count > 0 or runtime.webrtc_peer_count > 0
     if should_stream and not runtime.manager.is_streaming:
-        await runtime.manager.start_streaming(runtime.frame_callback, state_callback=runtime.state_callback)
+        await runtime.manager.start_streaming(runtime.on_frame)
     elif not should_stream and runtime.manager.is_streaming:
         await runtime.manager.stop_streaming()
+        # on_frame only records transitions while frames flow, so record the stop here.
+        await _persist_state(session_id, runtime.manager.get_state(), status="ready", streaming=False)
+        runtime.persisted_streaming = False
 
 
 async def _ensure_runtime(session_id: str) -> SimulationRuntime:
     runtime = simulations.get(session_id)
     if runtime:
         return runtime
-    config = await simulation_state.get_config(session_id)
+    config = await _get_config_cached(session_id)
     if not config:
         raise HTTPException(status_code=404, detail=f"Simulation {session_id} not found")
     manager = _create_manager(config)
     runtime = SimulationRuntime(config=config, manager=manager)
-    runtime.frame_callback = _build_frame_callback(session_id, runtime)
-    runtime.state_callback = _build_state_callback(session_id, runtime)
 
     if settings.webrtc_enabled and settings.webrtc_signaling_url:
         async def _on_peer_count(count: int) -> None:
@@ -143,6 +205,7 @@ async def _ensure_runtime(session_id: str) -> SimulationRuntime:
             session_id,
             config.fps,
             on_peer_count=_on_peer_count,
+            target_size=settings.webrtc_target_size,
         )
         await runtime.webrtc.start()
     simulations[session_id] = runtime
@@ -150,6 +213,7 @@ async def _ensure_runtime(session_id: str) -> SimulationRuntime:
 
 
 async def _remove_runtime(session_id: str) -> None:
+    _config_cache.pop(session_id, None)
     runtime = simulations.pop(session_id, None)
     if runtime:
         await runtime.manager.stop_streaming()
@@ -164,9 +228,12 @@ async def lifespan(app: FastAPI):
     logger.info("Simulation Agent starting up...")
     logger.info(f"MuJoCo available: {MUJOCO_AVAILABLE}")
     logger.info(f"PyBullet available: {PYBULLET_AVAILABLE}")
+    if settings.webrtc_enabled and settings.webrtc_hardware_encoder:
+        hardware_encoder = use_hardware_encoder()
+        logger.info(f"NVENC H.264 encoding: {hardware_encoder}")
     await init_redis()
     await session_events.start_listener()
-    session_events.register_handler("simulation", handle_session_event)
+    session_events.register_handler("simulation", _handle_session_event)
     try:
         yield
     finally:
@@ -187,6 +254,7 @@ app = FastAPI(
     description="MuJoCo and PyBullet simulation orchestration with WebRTC streaming",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -216,6 +284,7 @@ class SimulationControlRequest(BaseModel):
     """Request to control simulation (play, pause, reset, step)."""
     action: str  # 'play', 'pause', 'reset', 'step'
     actions: Optional[list] = None  # Control actions for step
+    action_batch: Optional[list[list]] = None  # Several steps in one request; returns the last state
 
 
 class CameraControlRequest(BaseModel):
@@ -228,22 +297,26 @@ class CameraControlRequest(BaseModel):
 
 # --- Health Check ---
 
+_STATIC_HEALTH = {
+    "status": "healthy",
+    "mujoco_available": MUJOCO_AVAILABLE,
+    "pybullet_available": PYBULLET_AVAILABLE,
+}
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    persisted = await simulation_state.list_session_ids()
     return {
-        "status": "healthy",
-        "mujoco_available": MUJOCO_AVAILABLE,
-        "pybullet_available": PYBULLET_AVAILABLE,
+        **_STATIC_HEALTH,
         "active_simulations": len(simulations),
-        "persisted_simulations": len(persisted),
+        "persisted_simulations": await simulation_state.count_sessions(),
     }
 
 
 @app.get("/sessions/active")
 async def list_active_sessions():
-    return {"sessions": get_active_sessions()}
+    return Response(content=get_active_sessions_json(), media_type="application/json")
 
 
 # --- Simulation Management ---
@@ -263,7 +336,7 @@ async def create_simulation(request: CreateSimulationRequest):
     if session_id in simulations:
         raise HTTPException(status_code=400, detail=f"Simulation {session_id} already exists")
 
-    if await simulation_state.get_config(session_id):
+    if await _get_config_cached(session_id):
         raise HTTPException(status_code=400, detail=f"Simulation {session_id} already persisted")
 
     config = simulation_state.SimulationConfig(
@@ -278,8 +351,6 @@ async def create_simulation(request: CreateSimulationRequest):
 
     manager = _create_manager(config)
     runtime = SimulationRuntime(config=config, manager=manager)
-    runtime.frame_callback = _build_frame_callback(session_id, runtime)
-    runtime.state_callback = _build_state_callback(session_id, runtime)
 
     if settings.webrtc_enabled and settings.webrtc_signaling_url:
         async def _on_peer_count(count: int) -> None:
@@ -291,12 +362,14 @@ async def create_simulation(request: CreateSimulationRequest):
             session_id,
             config.fps,
             on_peer_count=_on_peer_count,
+            target_size=settings.webrtc_target_size,
         )
 
     simulations[session_id] = runtime
 
     try:
         await simulation_state.persist_config(config)
+        _config_cache[session_id] = config
         state = runtime.manager.get_state()
         await _persist_state(
             session_id,
@@ -363,9 +436,11 @@ async def control_simulation(session_id: str, request: SimulationControlRequest)
             streaming_status = False
             state_snapshot = result
         elif request.action == "step":
-            import numpy as np
-            actions = np.array(request.actions) if request.actions else None
-            result = sim.step(actions)
+            if request.action_batch:
+                for actions in request.action_batch:
+                    result = sim.step(np.asarray(actions))
+            else:
+                result = sim.step(np.asarray(request.actions) if request.actions else None)
             state_snapshot = result
         elif request.action == "play":
             result = {"status": "playing", "message": "Use WebSocket for continuous streaming"}
@@ -408,16 +483,16 @@ async def set_camera(session_id: str, request: CameraControlRequest):
     runtime = await _ensure_runtime(session_id)
     sim = runtime.manager
     
-    if hasattr(sim, 'set_camera'):
+    try:
         sim.set_camera(
             distance=request.distance,
             yaw=request.yaw,
             pitch=request.pitch,
             target=request.target,
         )
-        return {"status": "camera_updated"}
-    else:
-        return {"status": "not_supported", "message": "Camera control not supported for this engine"}
+    except NotSupportedError as exc:
+        return {"status": "not_supported", "message": str(exc)}
+    return {"status": "camera_updated"}
 
 
 @app.delete("/simulations/{session_id}")
@@ -431,13 +506,14 @@ async def delete_simulation(session_id: str):
         Deletion confirmation
     """
     runtime_exists = session_id in simulations
-    config_exists = await simulation_state.get_config(session_id)
+    config_exists = await _get_config_cached(session_id)
     if not runtime_exists and not config_exists:
         raise HTTPException(status_code=404, detail=f"Simulation {session_id} not found")
 
     if runtime_exists:
         await _remove_runtime(session_id)
 
+    _config_cache.pop(session_id, None)
     await simulation_state.remove_simulation(session_id)
     
     logger.info(f"Deleted simulation {session_id}")
@@ -447,6 +523,38 @@ async def delete_simulation(session_id: str):
 
 # --- WebSocket Streaming ---
 
+_PONG = "pong"
+
+
+async def _handle_pause(websocket: WebSocket, session_id: str, runtime: SimulationRuntime) -> None:
+    await runtime.manager.stop_streaming()
+    await _persist_state(session_id, runtime.manager.get_state(), status="paused", streaming=False)
+
+
+async def _handle_play(websocket: WebSocket, session_id: str, runtime: SimulationRuntime) -> None:
+    await _update_streaming(session_id, runtime)
+
+
+async def _handle_reset(websocket: WebSocket, session_id: str, runtime: SimulationRuntime) -> None:
+    await runtime.manager.stop_streaming()
+    state = runtime.manager.reset()
+    await _persist_state(session_id, state, status="reset", streaming=False)
+
+
+async def _handle_ping(websocket: WebSocket, session_id: str, runtime: SimulationRuntime) -> None:
+    await websocket.send_text(_PONG)
+
+
+# Control commands may arrive as text or binary frames; one lookup serves both.
+_CONTROL_HANDLERS = {
+    "pause": _handle_pause,
+    "play": _handle_play,
+    "reset": _handle_reset,
+    "ping": _handle_ping,
+}
+_CONTROL_HANDLERS.update({command.encode(): handler for command, handler in list(_CONTROL_HANDLERS.items())})
+
+
 @app.websocket("/simulations/{session_id}/stream")
 async def stream_simulation(websocket: WebSocket, session_id: str):
     """WebSocket endpoint for streaming simulation frames to multiple clients."""
@@ -460,57 +568,41 @@ async def stream_simulation(websocket: WebSocket, session_id: str):
     await websocket.accept()
     logger.info(f"WebSocket connected for session {session_id}")
 
-    sim = runtime.manager
-
-    pubsub = await simulation_state.subscribe_frames(session_id)
+    # Frames are handed over in-process; Redis is only involved when other
+    # processes may hold subscribers for this session.
+    if settings.multi_process:
+        queue = simulation_state.subscribe_frames(session_id, maxsize=_FRAME_QUEUE_MAXSIZE)
+    else:
+        queue = asyncio.Queue(maxsize=_FRAME_QUEUE_MAXSIZE)
+        runtime.local_subscribers.append(queue)
 
     async def forward_frames():
         try:
             while True:
-                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-                if not message:
-                    await asyncio.sleep(0.01)
-                    continue
-                payload = message.get("data")
-                if not payload:
-                    continue
-                try:
-                    frame_bytes = simulation_state.decode_frame_message(payload)
-                except Exception as exc:  # pragma: no cover - defensive
-                    logger.error(f"Invalid frame payload: {exc}")
-                    continue
-                await websocket.send_bytes(frame_bytes)
+                frame_bytes = await queue.get()
+                await websocket.send_bytes(_latest_frame(queue, frame_bytes))
         except asyncio.CancelledError:
             pass
+        except Exception as exc:
+            logger.error(f"Frame forwarding failed for session {session_id}: {exc}", exc_info=True)
+            with suppress(Exception):  # socket may already be gone
+                await websocket.close(code=1011)
 
     forward_task = asyncio.create_task(forward_frames())
-    await _increment_subscribers(session_id)
+    _increment_subscribers(runtime)
     await _update_streaming(session_id, runtime)
 
     try:
         while True:
-            message = await websocket.receive_text()
-            if message == "pause":
-                await sim.stop_streaming()
-                await _persist_state(
-                    session_id,
-                    sim.get_state(),
-                    status="paused",
-                    streaming=False,
-                )
-            elif message == "play":
-                await _update_streaming(session_id, runtime)
-            elif message == "reset":
-                await sim.stop_streaming()
-                state = sim.reset()
-                await _persist_state(
-                    session_id,
-                    state,
-                    status="reset",
-                    streaming=False,
-                )
-            elif message == "ping":
-                await websocket.send_text("pong")
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            command = message.get("text")
+            if command is None:
+                command = message.get("bytes")
+            handler = _CONTROL_HANDLERS.get(command)
+            if handler is not None:
+                await handler(websocket, session_id, runtime)
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for session {session_id}")
     except Exception as e:
@@ -521,18 +613,19 @@ async def stream_simulation(websocket: WebSocket, session_id: str):
             await forward_task
         except asyncio.CancelledError:
             pass
-        await simulation_state.close_frame_subscription(pubsub)
-        remaining = await _decrement_subscribers(session_id)
+        if settings.multi_process:
+            await simulation_state.unsubscribe_frames(session_id, queue)
+        else:
+            runtime.local_subscribers.remove(queue)
+        remaining = _decrement_subscribers(runtime)
         if remaining == 0:
             await _update_streaming(session_id, runtime)
 
 
 # --- Info Endpoints ---
 
-@app.get("/")
-async def root():
-    """Root endpoint."""
-    return {
+_ROOT_PAYLOAD = orjson.dumps(
+    {
         "service": "CoSim Simulation Agent",
         "version": "1.0.0",
         "engines": {
@@ -540,6 +633,13 @@ async def root():
             "pybullet": PYBULLET_AVAILABLE,
         },
     }
+)
+
+
+@app.get("/")
+async def root():
+    """Root endpoint."""
+    return Response(content=_ROOT_PAYLOAD, media_type="application/json")
 
 
 # --- C++ Build Agent ---
@@ -552,10 +652,10 @@ async def build_cpp(request: Request):
     Returns BuildResult with compilation output and optional execution result.
     """
     from co_sim.services.build_agent import BuildRequest, compile_cpp, execute_binary, persist_build_status
-    import uuid as _uuid
+    import secrets
 
     payload = await request.json()
-    build_id = str(_uuid.uuid4())[:8]
+    build_id = secrets.token_hex(4)
 
     try:
         req = BuildRequest(**payload)
@@ -586,6 +686,133 @@ async def build_cpp(request: Request):
 
 # --- Code Execution ---
 
+# Upper bound on captured stdout/stderr per /execute call (characters).
+_EXECUTE_OUTPUT_LIMIT = 1024 * 1024
+
+class _ThreadCapture(io.TextIOBase):
+    """Stand-in for ``sys.stdout``/``sys.stderr`` that routes writes per thread.
+
+    ``contextlib.redirect_stdout`` swaps the process-wide stream, so concurrent
+    ``/execute`` calls would capture each other's output (and could leave
+    ``sys.stdout`` pointing at a finished buffer). Threads without an active
+    capture write through to the original stream.
+    """
+
+    def __init__(self, default: io.TextIOBase) -> None:
+        self._default = default
+        self._local = threading.local()
+
+    def _target(self):
+        buffer = getattr(self._local, "buffer", None)
+        return self._default if buffer is None else buffer
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    # Everything else (fileno, buffer, encoding, isatty, ...) is the real stream's,
+    # so subprocess inheritance, faulthandler and debuggers keep working.
+    def fileno(self) -> int:
+        return self._default.fileno()
+
+    def isatty(self) -> bool:
+        return self._default.isatty()
+
+    @property
+    def encoding(self):
+        return self._default.encoding
+
+    @property
+    def errors(self):
+        return self._default.errors
+
+    def __getattr__(self, name: str):
+        return getattr(self._default, name)
+
+    @contextmanager
+    def redirect(self, buffer: io.TextIOBase):
+        self._local.buffer = buffer
+        try:
+            yield
+        finally:
+            self._local.buffer = None
+
+
+class BoundedIO(io.TextIOBase):
+    """Write-only text buffer that keeps only the last ``limit`` characters.
+
+    Protects the worker from user code that prints in a tight loop; the
+    newest output (usually the interesting part) is kept.
+    """
+
+    def __init__(self, limit: int = _EXECUTE_OUTPUT_LIMIT) -> None:
+        self._limit = limit
+        self._chunks: deque[str] = deque()
+        self._size = 0
+        self.truncated = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        length = len(text)
+        if length > self._limit:
+            text = text[-self._limit:]
+            self.truncated = True
+        self._chunks.append(text)
+        self._size += len(text)
+        while self._size > self._limit:
+            self._size -= len(self._chunks.popleft())
+            self.truncated = True
+        return length
+
+    def getvalue(self) -> str:
+        value = "".join(self._chunks)
+        if self.truncated:
+            return "[... earlier output truncated ...]\n" + value
+        return value
+
+
+def _thread_capture(stream_name: str) -> _ThreadCapture:
+    stream = getattr(sys, stream_name)
+    if not isinstance(stream, _ThreadCapture):
+        stream = _ThreadCapture(stream)
+        setattr(sys, stream_name, stream)
+    return stream
+
+
+def _workdir_open(working_dir: str):
+    """``open`` for user code that resolves relative paths against ``working_dir``.
+
+    The process working directory is shared by every session on the worker, so
+    /execute never chdirs; scripts see their working directory through this.
+    """
+
+    def _open(file, *args, **kwargs):
+        if isinstance(file, (str, os.PathLike)) and not os.path.isabs(file):
+            file = os.path.join(working_dir, file)
+        return open(file, *args, **kwargs)
+
+    return _open
+
+
+def _run_user_code(
+    code: str,
+    context: Dict[str, Any],
+    stdout: io.TextIOBase,
+    stderr: io.TextIOBase,
+) -> None:
+    with _thread_capture("stdout").redirect(stdout), _thread_capture("stderr").redirect(stderr):
+        print("🔧 Starting code execution...")
+        exec(code, context, context)
+        print("✅ Code execution finished")
+
+
 class ExecuteCodeRequest(BaseModel):
     """Request to execute Python code in simulation context."""
     code: str
@@ -602,6 +829,10 @@ async def execute_code(session_id: str, request: ExecuteCodeRequest):
     - sim.step(actions) - Step with actions
     - sim.get_state() - Get current state
     - sim.render() - Get rendered frame
+
+    The code runs in a worker thread so that long-running scripts do not stall
+    frame streaming for other sessions on this worker.
+    Globals persist across calls on the same session, like a notebook kernel.
     
     Args:
         session_id: Session identifier
@@ -610,55 +841,39 @@ async def execute_code(session_id: str, request: ExecuteCodeRequest):
     Returns:
         Execution results including stdout, stderr, and final state
     """
-    import sys
-    import os
-    from io import StringIO
-    
     runtime = await _ensure_runtime(session_id)
     sim = runtime.manager
     
-    # Debug: Log the code being executed (BEFORE capturing stdout)
     logger.info(f"📝 Executing code (length={len(request.code)})")
     logger.info(f"First 200 chars: {request.code[:200]}")
     
-    # Capture stdout/stderr
-    old_stdout = sys.stdout
-    old_stderr = sys.stderr
-    stdout_capture = StringIO()
-    stderr_capture = StringIO()
+    stdout_capture = BoundedIO()
+    stderr_capture = BoundedIO()
     captured_stdout = ""
     captured_stderr = ""
     
     try:
-        sys.stdout = stdout_capture
-        sys.stderr = stderr_capture
-        
-        # Test that stdout capture is working
-        print("🔧 Starting code execution...")
-        sys.stdout.flush()
-        
-        # Create execution context with simulation API
-        context = {
-            'sim': sim,
-            'np': __import__('numpy'),
-            'time': __import__('time'),
-            'get_simulation': lambda: sim,  # Alias for CoSim compatibility
-            'print': print,  # Explicitly provide print function
-            '__name__': '__main__',  # Set __name__ so if __name__ == "__main__" works
-        }
-        
-        # Change working directory if specified
-        if request.working_dir and os.path.exists(request.working_dir):
-            os.chdir(request.working_dir)
-        
-        # Execute user code
-        exec(request.code, context, context)
-        
-        print("✅ Code execution finished")
-        
-        # Force flush to ensure all output is captured
-        sys.stdout.flush()
-        sys.stderr.flush()
+        # Waiting for the session's lock happens on the event loop, so queued
+        # calls do not hold executor threads.
+        async with runtime.exec_lock:
+            context = runtime.exec_context
+            if context is None:
+                # Create execution context with simulation API
+                context = runtime.exec_context = {
+                    'np': np,
+                    'time': time,
+                    'get_simulation': lambda: sim,  # Alias for CoSim compatibility
+                    'print': print,  # Explicitly provide print function
+                }
+            context['sim'] = sim
+            context['__name__'] = '__main__'  # Set __name__ so if __name__ == "__main__" works
+            working_dir = request.working_dir if request.working_dir and os.path.isdir(request.working_dir) else None
+            context['WORKING_DIR'] = working_dir
+            context['open'] = _workdir_open(working_dir) if working_dir else open
+
+            await asyncio.get_running_loop().run_in_executor(
+                None, _run_user_code, request.code, context, stdout_capture, stderr_capture
+            )
         
         # Get final simulation state (with error handling)
         try:
@@ -667,7 +882,6 @@ async def execute_code(session_id: str, request: ExecuteCodeRequest):
             logger.warning(f"Could not get final state: {e}")
             final_state = {"status": "completed", "note": "State unavailable after execution"}
         
-        # Debug: Check what we captured (BEFORE restoring stdout)
         captured_stdout = stdout_capture.getvalue()
         captured_stderr = stderr_capture.getvalue()
         
@@ -692,13 +906,9 @@ async def execute_code(session_id: str, request: ExecuteCodeRequest):
         }
     
     finally:
-        sys.stdout = old_stdout
-        sys.stderr = old_stderr
-        
-        # Debug log AFTER restoring stdout
         logger.info(f"✅ Execution complete. Captured stdout length: {len(captured_stdout)}, stderr length: {len(captured_stderr)}")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8005, log_level="info")
+    uvicorn.run(app, host="0.0.0.0", port=8005, log_level="info", loop="uvloop", http="httptools")
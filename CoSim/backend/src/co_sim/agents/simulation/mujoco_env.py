@@ -3,11 +3,14 @@ import asyncio
 import base64
 import io
 import logging
+import threading
 from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 import numpy as np
 from PIL import Image
 
+from co_sim.agents.simulation.base import SimulationManager
+
 try:
     import mujoco
     import mujoco.viewer
@@ -116,27 +119,38 @@ class MuJoCoEnvironment:
             "qvel": self.data.qvel.tolist(),
         }
     
-    def render_frame(self) -> bytes:
-        """Render current frame and return as JPEG bytes.
+    def render_pixels(self) -> Optional[np.ndarray]:
+        """Render current frame as raw pixels.
         
         Returns:
-            JPEG-encoded image bytes
+            Freshly allocated HxWx3 uint8 RGB array, or None when a GUI
+            viewer renders instead
         """
         if self.headless:
-            # Update renderer and get pixels
             self.renderer.update_scene(self.data)
-            pixels = self.renderer.render()
-            
-            # Convert to PIL Image and encode as JPEG
-            image = Image.fromarray(pixels)
-            buffer = io.BytesIO()
-            image.save(buffer, format='JPEG', quality=85)
-            return buffer.getvalue()
-        else:
-            # For non-headless mode, viewer handles rendering
-            if self.viewer:
-                self.viewer.sync()
+            return self.renderer.render()
+        # For non-headless mode, viewer handles rendering
+        if self.viewer:
+            self.viewer.sync()
+        return None
+    
+    def render_frame(self, pixels: Optional[np.ndarray] = None) -> bytes:
+        """Render current frame and return as JPEG bytes.
+        
+        Args:
+            pixels: Already rendered pixels to encode instead of rendering again
+        
+        Returns:
+            JPEG-encoded image bytes
+        """
+        if pixels is None:
+            pixels = self.render_pixels()
+        if pixels is None:
             return b''
+        image = Image.fromarray(pixels)
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=85)
+        return buffer.getvalue()
     
     def get_frame_base64(self) -> str:
         """Render frame and encode as base64 string.
@@ -172,7 +186,7 @@ class MuJoCoEnvironment:
         logger.info("MuJoCo environment closed")
 
 
-class MuJoCoStreamManager:
+class MuJoCoStreamManager(SimulationManager):
     """Manages MuJoCo simulation lifecycle and frame streaming."""
     
     def __init__(self, model_path: str, **kwargs):
@@ -185,16 +199,21 @@ class MuJoCoStreamManager:
         self.env = MuJoCoEnvironment(model_path, **kwargs)
         self.is_streaming = False
         self._stream_task: Optional[asyncio.Task] = None
+        # Serializes env access between the stream loop and user code
+        # running in executor threads (see the /execute endpoint).
+        self.lock = threading.RLock()
     
     async def start_streaming(
         self,
-        frame_callback,
-        state_callback: Callable[[Dict[str, Any]], Awaitable[None] | None] | None = None,
+        on_frame: Callable[[bytes, Dict[str, Any], Optional[np.ndarray]], Awaitable[None]],
     ):
         """Start streaming frames at target FPS.
         
         Args:
-            frame_callback: Async function called with each frame (bytes)
+            on_frame: Async function called each tick with the JPEG frame
+                (bytes, possibly empty), the state after the step, and the raw
+                RGB pixels the JPEG was encoded from (None if unavailable).
+                The pixel array is not reused by the manager.
         """
         if self.is_streaming:
             logger.warning("Streaming already active")
@@ -204,27 +223,19 @@ class MuJoCoStreamManager:
         self.env.is_running = True
         
         frame_interval = 1.0 / self.env.fps
-        
-        async def _maybe_emit_state(state: Dict[str, Any]):
-            if not state_callback:
-                return
-            result = state_callback(state)
-            if asyncio.iscoroutine(result):
-                await result
 
         async def stream_loop():
             try:
                 while self.is_streaming:
                     loop_start = asyncio.get_event_loop().time()
                     
-                    # Step simulation
-                    state = self.env.step()
+                    # Step simulation and render the frame
+                    with self.lock:
+                        state = self.env.step()
+                        pixels = self.env.render_pixels()
+                    frame_bytes = self.env.render_frame(pixels) if pixels is not None else b''
                     
-                    # Render and send frame
-                    frame_bytes = self.env.render_frame()
-                    if frame_bytes:
-                        await frame_callback(frame_bytes)
-                    await _maybe_emit_state(state)
+                    await on_frame(frame_bytes, state, pixels)
                     
                     # Maintain target FPS
                     elapsed = asyncio.get_event_loop().time() - loop_start
@@ -260,15 +271,18 @@ class MuJoCoStreamManager:
     
     def reset(self) -> Dict[str, Any]:
         """Reset simulation."""
-        return self.env.reset()
+        with self.lock:
+            return self.env.reset()
     
     def step(self, actions: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Step simulation."""
-        return self.env.step(actions)
+        with self.lock:
+            return self.env.step(actions)
     
     def get_state(self) -> Dict[str, Any]:
         """Get current state."""
-        return self.env.get_state()
+        with self.lock:
+            return self.env.get_state()
     
     def close(self):
         """Close environment."""
@@ -3,11 +3,14 @@ import asyncio
 import base64
 import io
 import logging
+import threading
 from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 import numpy as np
 from PIL import Image
 
+from co_sim.agents.simulation.base import SimulationManager
+
 try:
     import pybullet as p
     import pybullet_data
@@ -162,11 +165,12 @@ class PyBulletEnvironment:
             **robot_state,
         }
     
-    def render_frame(self) -> bytes:
-        """Render current frame and return as JPEG bytes.
+    def render_pixels(self) -> np.ndarray:
+        """Render current frame as raw pixels.
         
         Returns:
-            JPEG-encoded image bytes
+            Freshly allocated HxWx3 uint8 RGB array (a view that drops the
+            alpha channel of the camera image)
         """
         # Get camera view matrix
         view_matrix = p.computeViewMatrixFromYawPitchRoll(
@@ -195,11 +199,22 @@ class PyBulletEnvironment:
             renderer=p.ER_BULLET_HARDWARE_OPENGL if not self.headless else p.ER_TINY_RENDERER
         )
         
-        # Convert to RGB and encode as JPEG
+        # Convert to RGB
         rgb_array = np.array(px, dtype=np.uint8).reshape((self.height, self.width, 4))
-        rgb_array = rgb_array[:, :, :3]  # Remove alpha channel
+        return rgb_array[:, :, :3]  # Remove alpha channel
+    
+    def render_frame(self, pixels: Optional[np.ndarray] = None) -> bytes:
+        """Render current frame and return as JPEG bytes.
         
-        image = Image.fromarray(rgb_array)
+        Args:
+            pixels: Already rendered pixels to encode instead of rendering again
+        
+        Returns:
+            JPEG-encoded image bytes
+        """
+        if pixels is None:
+            pixels = self.render_pixels()
+        image = Image.fromarray(pixels)
         buffer = io.BytesIO()
         image.save(buffer, format='JPEG', quality=85)
         return buffer.getvalue()
@@ -271,7 +286,7 @@ class PyBulletEnvironment:
         logger.info("PyBullet environment closed")
 
 
-class PyBulletStreamManager:
+class PyBulletStreamManager(SimulationManager):
     """Manages PyBullet simulation lifecycle and frame streaming."""
     
     def __init__(self, urdf_path: Optional[str] = None, **kwargs):
@@ -284,16 +299,21 @@ class PyBulletStreamManager:
         self.env = PyBulletEnvironment(urdf_path, **kwargs)
         self.is_streaming = False
         self._stream_task: Optional[asyncio.Task] = None
+        # Serializes env access between the stream loop and user code
+        # running in executor threads (see the /execute endpoint).
+        self.lock = threading.RLock()
     
     async def start_streaming(
         self,
-        frame_callback,
-        state_callback: Callable[[Dict[str, Any]], Awaitable[None] | None] | None = None,
+        on_frame: Callable[[bytes, Dict[str, Any], Optional[np.ndarray]], Awaitable[None]],
     ):
         """Start streaming frames at target FPS.
         
         Args:
-            frame_callback: Async function called with each frame (bytes)
+            on_frame: Async function called each tick with the JPEG frame
+                (bytes, possibly empty), the state after the step, and the raw
+                RGB pixels the JPEG was encoded from (None if unavailable).
+                The pixel array is not reused by the manager.
         """
         if self.is_streaming:
             logger.warning("Streaming already active")
@@ -303,27 +323,19 @@ class PyBulletStreamManager:
         self.env.is_running = True
         
         frame_interval = 1.0 / self.env.fps
-        
-        async def _maybe_emit_state(state: Dict[str, Any]):
-            if not state_callback:
-                return
-            result = state_callback(state)
-            if asyncio.iscoroutine(result):
-                await result
 
         async def stream_loop():
             try:
                 while self.is_streaming:
                     loop_start = asyncio.get_event_loop().time()
                     
-                    # Step simulation
-                    state = self.env.step()
+                    # Step simulation and render the frame
+                    with self.lock:
+                        state = self.env.step()
+                        pixels = self.env.render_pixels()
+                    frame_bytes = self.env.render_frame(pixels)
                     
-                    # Render and send frame
-                    frame_bytes = self.env.render_frame()
-                    if frame_bytes:
-                        await frame_callback(frame_bytes)
-                    await _maybe_emit_state(state)
+                    await on_frame(frame_bytes, state, pixels)
                     
                     # Maintain target FPS
                     elapsed = asyncio.get_event_loop().time() - loop_start
@@ -359,19 +371,23 @@ class PyBulletStreamManager:
     
     def reset(self) -> Dict[str, Any]:
         """Reset simulation."""
-        return self.env.reset()
+        with self.lock:
+            return self.env.reset()
     
     def step(self, actions: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Step simulation."""
-        return self.env.step(actions)
+        with self.lock:
+            return self.env.step(actions)
     
     def get_state(self) -> Dict[str, Any]:
         """Get current state."""
-        return self.env.get_state()
+        with self.lock:
+            return self.env.get_state()
     
-    def set_camera(self, **kwargs):
+    def set_camera(self, distance: float, yaw: float, pitch: float, target: list) -> None:
         """Set camera parameters."""
-        self.env.set_camera(**kwargs)
+        with self.lock:
+            self.env.set_camera(distance=distance, yaw=yaw, pitch=pitch, target=target)
     
     def close(self):
         """Close environment."""
@@ -1,22 +1,40 @@
 from __future__ import annotations
 
-from collections import OrderedDict
 from typing import Dict
 
-_active_sessions: Dict[str, str] = OrderedDict()
+import orjson
+
+_active_sessions: Dict[str, str] = {}
+# Rebuilt lazily after a mutation; callers must treat it as read-only.
+_snapshot: list[dict[str, str]] | None = None
+_snapshot_json: bytes | None = None
 
 
 def handle_session_event(event: dict) -> None:
+    global _snapshot, _snapshot_json
     session = event.get("session") or {}
     session_id = str(session.get("id"))
     status = session.get("status")
     if not session_id or status is None:
         return
     if status == "terminated":
-        _active_sessions.pop(session_id, None)
-    else:
+        if _active_sessions.pop(session_id, None) is not None:
+            _snapshot = _snapshot_json = None
+    elif _active_sessions.get(session_id) != status:
         _active_sessions[session_id] = status
+        _snapshot = _snapshot_json = None
 
 
 def get_active_sessions() -> list[dict[str, str]]:
-    return [{"id": session_id, "status": status} for session_id, status in list(_active_sessions.items())]
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = [{"id": session_id, "status": status} for session_id, status in _active_sessions.items()]
+    return _snapshot
+
+
+def get_active_sessions_json() -> bytes:
+    """Return ``{"sessions": [...]}`` pre-encoded, re-encoding only after a change."""
+    global _snapshot_json
+    if _snapshot_json is None:
+        _snapshot_json = orjson.dumps({"sessions": get_active_sessions()})
+    return _snapshot_json
@@ -1,37 +1,130 @@
 from __future__ import annotations
 
 import asyncio
-import json
+from concurrent.futures import ThreadPoolExecutor
 from fractions import Fraction
 import contextlib
 import io
+import logging
 from typing import Any, Awaitable, Callable
 
+import av
 import numpy as np
+import orjson
 from PIL import Image
-from aiortc import RTCPeerConnection, RTCSessionDescription, RTCIceCandidate, MediaStreamTrack
+from aiortc import RTCPeerConnection, RTCRtpSender, RTCSessionDescription, RTCIceCandidate, MediaStreamTrack
+from aiortc import rtcrtpsender
+from aiortc.codecs import get_encoder
+from aiortc.codecs.h264 import MAX_FRAME_RATE, H264Encoder
+from aiortc.contrib.media import MediaRelay
+from aiortc.mediastreams import MediaStreamError
+from aiortc.sdp import candidate_to_sdp
 from av import VideoFrame
 import websockets
 
+try:
+    from turbojpeg import TJPF_RGB, TurboJPEG
+
+    _TURBOJPEG: TurboJPEG | None = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # package or libturbojpeg missing
+    _TURBOJPEG = None
+
+logger = logging.getLogger(__name__)
+
+# Encoded frames are told apart from raw RGB by their magic bytes (JPEG, PNG).
+_JPEG_MAGIC = b"\xff\xd8"
+_ENCODED_MAGIC = (_JPEG_MAGIC, b"\x89PNG")
+_DECODE_WORKERS = 2
+# Enough decode targets that the slot being written is never the one readers hold.
+_FRAME_SLOTS = 3
+
+# Answers carry only H.264 (and its RTX) when the offer has it, matching the
+# encoder path and keeping the per-peer SDP short. Capabilities are static.
+_H264_RTPMAP = "H264/90000"
+_H264_PREFERENCES = [
+    codec
+    for codec in RTCRtpSender.getCapabilities("video").codecs
+    if codec.mimeType.lower() in ("video/h264", "video/rtx")
+]
+
+# Parsed signaling messages waiting for the handler; a full queue pauses socket reads.
+_SIGNAL_QUEUE_SIZE = 64
+
+# Signaling message types exchanged with the relay server.
+_TYPE_JOIN = "join"
+_TYPE_ICE = "ice-candidate"
+_TYPE_ANSWER = "answer"
+
+
+def _decode_frame(frame_bytes: bytes, out: np.ndarray | None = None) -> np.ndarray:
+    """Decode an encoded frame to HxWx3 uint8 RGB; runs on the decode pool.
+
+    JPEGs are decoded straight into ``out`` when its shape matches.
+    """
+    if _TURBOJPEG is not None and frame_bytes.startswith(_JPEG_MAGIC):
+        if out is not None:
+            try:
+                return _TURBOJPEG.decode(frame_bytes, pixel_format=TJPF_RGB, dst=out)
+            except ValueError:  # frame size changed
+                pass
+        return _TURBOJPEG.decode(frame_bytes, pixel_format=TJPF_RGB)
+    image = Image.open(io.BytesIO(frame_bytes))
+    image.load()
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return np.asarray(image)
+
+
+def _resize_frame(frame: np.ndarray, size: tuple[int, int]) -> np.ndarray:
+    """Scale an RGB frame to ``size`` (width, height); runs on the decode pool.
+
+    Pillow-SIMD, when installed in place of Pillow, vectorizes this resize.
+    """
+    return np.asarray(Image.fromarray(frame).resize(size, Image.BILINEAR))
+
 
 class FrameBuffer:
-    def __init__(self) -> None:
-        self._condition = asyncio.Condition()
+    def __init__(self, slots: int = _FRAME_SLOTS) -> None:
+        # Swapped for a fresh event on every frame, so waking readers is one set()
+        # and no reader re-acquires a lock.
+        self._new_frame = asyncio.Event()
         self._frame: np.ndarray | None = None
         self._sequence = 0
+        self._slot_count = slots
+        self._slots: list[np.ndarray] = []
+        self._write_index = 0
+        self._closed = False
+
+    def writable_slot(self, height: int, width: int) -> np.ndarray:
+        """Return the next preallocated HxWx3 buffer for the single writer to fill.
+
+        Readers copy the published frame into a ``VideoFrame`` before yielding to
+        the loop, so with three slots the one handed out here is never in use.
+        """
+        if not self._slots or self._slots[0].shape[:2] != (height, width):
+            self._slots = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(self._slot_count)]
+            self._write_index = 0
+        slot = self._slots[self._write_index]
+        self._write_index = (self._write_index + 1) % self._slot_count
+        return slot
 
     async def update(self, frame: np.ndarray) -> None:
-        async with self._condition:
-            self._frame = frame
-            self._sequence += 1
-            self._condition.notify_all()
+        self._frame = frame
+        self._sequence += 1
+        event, self._new_frame = self._new_frame, asyncio.Event()
+        event.set()
 
     async def next_frame(self, last_sequence: int) -> tuple[np.ndarray, int]:
-        async with self._condition:
-            await self._condition.wait_for(
-                lambda: self._frame is not None and self._sequence != last_sequence
-            )
-            return self._frame, self._sequence
+        while self._frame is None or self._sequence == last_sequence:
+            if self._closed:
+                raise MediaStreamError
+            await self._new_frame.wait()
+        return self._frame, self._sequence
+
+    def close(self) -> None:
+        """End the stream: current and future readers get ``MediaStreamError``."""
+        self._closed = True
+        self._new_frame.set()
 
 
 class BroadcastVideoTrack(MediaStreamTrack):
@@ -47,12 +140,100 @@ class BroadcastVideoTrack(MediaStreamTrack):
     async def recv(self) -> VideoFrame:
         frame_array, sequence = await self._buffer.next_frame(self._last_sequence)
         self._last_sequence = sequence
-        frame = VideoFrame.from_ndarray(frame_array, format="rgb24")
+        # Convert to the encoders' yuv420p once here (libswscale), not once per peer encoder.
+        frame = VideoFrame.from_ndarray(frame_array, format="rgb24").reformat(format="yuv420p")
         frame.pts = sequence
         frame.time_base = self._time_base
         return frame
 
 
+_NVENC_CODEC = "h264_nvenc"
+# Long IPPP GOP: peers request keyframes through RTCP when they need one.
+_NVENC_GOP_SIZE = 600
+# Latched when NVENC cannot be used at all on this host. Once a context has
+# opened, later open failures are transient (e.g. the GPU's concurrent session
+# limit) and only that encoder falls back to software.
+_nvenc_unavailable = False
+_nvenc_opened = False
+
+
+def _open_nvenc(width: int, height: int, bit_rate: int) -> av.VideoCodecContext | None:
+    """Open an NVENC H.264 context, or return None to encode this stream in software."""
+    global _nvenc_unavailable, _nvenc_opened
+    if _nvenc_unavailable:
+        return None
+    try:
+        codec = av.CodecContext.create(_NVENC_CODEC, "w")
+    except (av.FFmpegError, ValueError) as exc:
+        logger.warning("NVENC unavailable, using software H.264: %s", exc)
+        _nvenc_unavailable = True
+        return None
+    codec.width = width
+    codec.height = height
+    codec.bit_rate = bit_rate
+    codec.pix_fmt = "yuv420p"
+    codec.framerate = Fraction(MAX_FRAME_RATE, 1)
+    codec.time_base = Fraction(1, MAX_FRAME_RATE)
+    codec.gop_size = _NVENC_GOP_SIZE
+    # No reordering or lookahead: each packet leaves as soon as its frame is encoded.
+    codec.max_b_frames = 0
+    codec.flags |= av.codec.context.Flags.low_delay
+    # Lowest-latency preset and tuning; baseline matches the profile aiortc negotiates.
+    codec.options = {
+        "preset": "p1",
+        "tune": "ull",
+        "profile": "baseline",
+        "zerolatency": "1",
+        "rc-lookahead": "0",
+        "delay": "0",
+    }
+    try:
+        codec.open()
+    except (av.FFmpegError, ValueError) as exc:
+        if _nvenc_opened:
+            logger.warning("NVENC context could not be opened, this stream uses software H.264: %s", exc)
+        else:
+            # Never opened here: no usable GPU encoder device.
+            logger.warning("NVENC unavailable, using software H.264: %s", exc)
+            _nvenc_unavailable = True
+        return None
+    _nvenc_opened = True
+    return codec
+
+
+class NvencH264Encoder(H264Encoder):
+    """aiortc's H.264 encoder with the bitstream produced by NVENC when it can be opened."""
+
+    def _encode_frame(self, frame: av.VideoFrame, force_keyframe: bool):
+        if self.codec and (
+            frame.width != self.codec.width
+            or frame.height != self.codec.height
+            or abs(self.target_bitrate - self.codec.bit_rate) / self.codec.bit_rate > 0.1
+        ):
+            self.buffer_data = b""
+            self.buffer_pts = None
+            self.codec = None
+        if self.codec is None:
+            # Left as None on failure, so the parent opens its libx264 context instead.
+            self.codec = _open_nvenc(frame.width, frame.height, self.target_bitrate)
+        return super()._encode_frame(frame, force_keyframe)
+
+
+def _get_encoder(codec):
+    if codec.mimeType.lower() == "video/h264":
+        return NvencH264Encoder()
+    return get_encoder(codec)
+
+
+def use_hardware_encoder() -> bool:
+    """Route aiortc's H.264 encoding through NVENC if a GPU encoder can be opened here."""
+    if _open_nvenc(256, 256, 1_000_000) is None:
+        return False
+    # aiortc resolves encoders through this module-level lookup when a sender starts.
+    rtcrtpsender.get_encoder = _get_encoder
+    return True
+
+
 class WebRTCBroadcaster:
     def __init__(
         self,
@@ -60,16 +241,29 @@ class WebRTCBroadcaster:
         room_id: str,
         fps: int,
         on_peer_count: Callable[[int], Awaitable[None] | None] | None = None,
+        target_size: tuple[int, int] | None = None,
     ) -> None:
+        """``target_size`` is the (width, height) sent to peers; None streams frames as published."""
         self._signaling_url = signaling_url
         self._room_id = room_id
         self._fps = fps
         self._on_peer_count = on_peer_count
-        self._buffer = FrameBuffer()
+        self._target_size = tuple(target_size) if target_size else None
+        self._reset_media()
         self._peers: dict[str, RTCPeerConnection] = {}
         self._socket: websockets.WebSocketClientProtocol | None = None
         self._task: asyncio.Task | None = None
+        self._signal_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=_SIGNAL_QUEUE_SIZE)
+        self._consumer_task: asyncio.Task | None = None
         self._client_id: str | None = None
+        self._frame_size: tuple[int, int] | None = None
+        self._decode_pool: ThreadPoolExecutor | None = None
+
+    def _reset_media(self) -> None:
+        self._buffer = FrameBuffer()
+        # One source track pulls each frame once; the relay fans it out to every peer.
+        self._source_track = BroadcastVideoTrack(self._buffer, self._fps)
+        self._relay = MediaRelay()
 
     @property
     def peer_count(self) -> int:
@@ -79,21 +273,67 @@ class WebRTCBroadcaster:
         if self._task and not self._task.done():
             return
         self._task = asyncio.create_task(self._signaling_loop())
+        self._consumer_task = asyncio.create_task(self._consume_signals())
 
     async def stop(self) -> None:
-        if self._task:
-            self._task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._task
+        for task in (self._task, self._consumer_task):
+            if task:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._consumer_task = None
+        self._signal_queue = asyncio.Queue(maxsize=_SIGNAL_QUEUE_SIZE)
         if self._socket:
             await self._socket.close()
             self._socket = None
         await self._close_all_peers()
+        # Ending the source lets the relay's reader task finish.
+        self._source_track.stop()
+        self._buffer.close()
+        self._reset_media()
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown(wait=False, cancel_futures=True)
+            self._decode_pool = None
 
     async def publish_frame(self, frame_bytes: bytes) -> None:
-        image = Image.open(io.BytesIO(frame_bytes)).convert("RGB")
-        frame_array = np.array(image)
-        await self._buffer.update(frame_array)
+        height_width = self._frame_size
+        if (
+            height_width is not None
+            and len(frame_bytes) == height_width[0] * height_width[1] * 3
+            and not frame_bytes.startswith(_ENCODED_MAGIC)
+        ):
+            # Uncompressed RGB of the known size: view the bytes directly. The
+            # read-only array keeps ``frame_bytes`` alive until the encoder copies it.
+            frame_array = np.frombuffer(frame_bytes, dtype=np.uint8).reshape(*height_width, 3)
+        else:
+            # Decoding is CPU-bound; keep it off the loop that serves signaling and ICE.
+            # Reuse a ring slot sized from the previous frame instead of allocating one per frame.
+            out = self._buffer.writable_slot(*height_width) if height_width is not None else None
+            frame_array = await self._run_in_pool(_decode_frame, frame_bytes, out)
+            self._frame_size = frame_array.shape[:2]
+        await self._buffer.update(await self._scaled(frame_array))
+
+    async def publish_pixels(self, pixels: np.ndarray) -> None:
+        """Publish an HxWx3 uint8 RGB frame without a JPEG round-trip.
+
+        The array is referenced, not copied, when already contiguous, so the
+        caller must not write to it afterwards.
+        """
+        await self._buffer.update(await self._scaled(np.ascontiguousarray(pixels)))
+
+    async def _scaled(self, frame_array: np.ndarray) -> np.ndarray:
+        size = self._target_size
+        if size is None or (frame_array.shape[1], frame_array.shape[0]) == size:
+            return frame_array
+        return await self._run_in_pool(_resize_frame, frame_array, size)
+
+    async def _run_in_pool(self, func: Callable[..., np.ndarray], *args: Any) -> np.ndarray:
+        if self._decode_pool is None:
+            self._decode_pool = ThreadPoolExecutor(
+                max_workers=_DECODE_WORKERS, thread_name_prefix="webrtc-decode"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._decode_pool, func, *args)
 
     async def _close_all_peers(self) -> None:
         peers = list(self._peers.values())
@@ -113,8 +353,16 @@ class WebRTCBroadcaster:
         async with websockets.connect(self._signaling_url) as websocket:
             self._socket = websocket
             async for message in websocket:
-                payload = json.loads(message)
+                await self._signal_queue.put(orjson.loads(message))
+
+    async def _consume_signals(self) -> None:
+        # Runs apart from the socket reader so a slow offer does not stall parsing.
+        while True:
+            payload = await self._signal_queue.get()
+            try:
                 await self._handle_signal(payload)
+            except Exception:
+                logger.exception("Failed to handle signaling message %r", payload.get("type"))
 
     async def _handle_signal(self, payload: dict[str, Any]) -> None:
         message_type = payload.get("type")
@@ -122,7 +370,7 @@ class WebRTCBroadcaster:
             self._client_id = payload.get("clientId")
             await self._send(
                 {
-                    "type": "join",
+                    "type": _TYPE_JOIN,
                     "roomId": self._room_id,
                     "role": "broadcaster",
                 }
@@ -154,18 +402,27 @@ class WebRTCBroadcaster:
         self._peers[peer_id] = pc
         await self._notify_peer_count()
 
-        pc.addTrack(BroadcastVideoTrack(self._buffer, self._fps))
+        # Unbuffered: a slow peer skips to the newest frame instead of queueing old ones.
+        sender = pc.addTrack(self._relay.subscribe(self._source_track, buffered=False))
+        if _H264_RTPMAP in offer["sdp"]:
+            transceiver = next(t for t in pc.getTransceivers() if t.sender is sender)
+            transceiver.setCodecPreferences(_H264_PREFERENCES)
 
         @pc.on("icecandidate")
         async def on_icecandidate(candidate: RTCIceCandidate | None) -> None:
             if candidate is None:
                 return
+            # RTCIceCandidate has no SDP form of its own; serialize once per candidate object.
+            sdp = getattr(candidate, "_cached_sdp", None)
+            if sdp is None:
+                sdp = "candidate:" + candidate_to_sdp(candidate)
+                candidate._cached_sdp = sdp
             await self._send(
                 {
-                    "type": "ice-candidate",
+                    "type": _TYPE_ICE,
                     "targetId": peer_id,
                     "candidate": {
-                        "candidate": getattr(candidate, "candidate", None) or candidate.to_sdp(),
+                        "candidate": sdp,
                         "sdpMid": candidate.sdpMid,
                         "sdpMLineIndex": candidate.sdpMLineIndex,
                     },
@@ -177,7 +434,7 @@ class WebRTCBroadcaster:
         await pc.setLocalDescription(answer)
         await self._send(
             {
-                "type": "answer",
+                "type": _TYPE_ANSWER,
                 "targetId": peer_id,
                 "answer": {"type": pc.localDescription.type, "sdp": pc.localDescription.sdp},
             }
@@ -208,4 +465,5 @@ class WebRTCBroadcaster:
     async def _send(self, message: dict[str, Any]) -> None:
         if not self._socket:
             return
-        await self._socket.send(json.dumps(message))
+        # Signaling peers expect text frames, so send the encoded JSON as str.
+        await self._socket.send(orjson.dumps(message).decode())
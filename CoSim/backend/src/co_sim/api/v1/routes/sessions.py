@@ -75,10 +75,10 @@ async def pause_session(
     _: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
 ) -> SessionRead:
-    db_session = await session_service.get_session(session, session_id)
-    if not db_session:
+    session_read = await session_service.transition_status_by_id(session, session_id, SessionStatus.PAUSED)
+    if not session_read:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
-    return await session_service.transition_status(session, db_session, SessionStatus.PAUSED)
+    return session_read
 
 
 @router.post("/{session_id}/resume", response_model=SessionRead)
@@ -87,10 +87,10 @@ async def resume_session(
     _: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
 ) -> SessionRead:
-    db_session = await session_service.get_session(session, session_id)
-    if not db_session:
+    session_read = await session_service.transition_status_by_id(session, session_id, SessionStatus.RUNNING)
+    if not session_read:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
-    return await session_service.transition_status(session, db_session, SessionStatus.RUNNING)
+    return session_read
 
 
 @router.post("/{session_id}/terminate", response_model=SessionRead)
@@ -99,10 +99,10 @@ async def terminate_session(
     _: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
 ) -> SessionRead:
-    db_session = await session_service.get_session(session, session_id)
-    if not db_session:
+    session_read = await session_service.transition_status_by_id(session, session_id, SessionStatus.TERMINATED)
+    if not session_read:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
-    return await session_service.transition_status(session, db_session, SessionStatus.TERMINATED)
+    return session_read
 
 
 @router.post("/{session_id}/participants", response_model=SessionParticipantRead, status_code=status.HTTP_201_CREATED)
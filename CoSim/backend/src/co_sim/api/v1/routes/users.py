@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from copy import deepcopy
 from typing import Any
 
 from co_sim.typing import Annotated
 
+import orjson
 from fastapi import APIRouter, Depends
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,46 +21,54 @@ from co_sim.schemas.user import (
     UserProfileResponse,
     UserProfileUpdate,
 )
+from co_sim.services import activity_stats
 
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 DEFAULT_PREFERENCES_DICT = UserPreferences().model_dump()
+# Preferences are plain JSON, so a fresh copy is one orjson parse rather than a deepcopy walk.
+_DEFAULT_PREFERENCES_JSON = orjson.dumps(DEFAULT_PREFERENCES_DICT)
 
 
 def _deep_merge(base: dict[str, Any], updates: dict[str, Any]) -> dict[str, Any]:
-    for key, value in updates.items():
-        if isinstance(value, dict) and isinstance(base.get(key), dict):
-            base[key] = _deep_merge(dict(base[key]), value)
-        else:
-            base[key] = value
+    """Merge ``updates`` into ``base`` in place; ``base`` must be owned by the caller."""
+    pending = [(base, updates)]
+    while pending:
+        target, changes = pending.pop()
+        for key, value in changes.items():
+            existing = target.get(key)
+            if isinstance(value, dict) and isinstance(existing, dict):
+                pending.append((existing, value))
+            else:
+                target[key] = value
     return base
 
 
 def _resolved_preferences(user: User) -> dict[str, Any]:
-    current = deepcopy(DEFAULT_PREFERENCES_DICT)
+    current = orjson.loads(_DEFAULT_PREFERENCES_JSON)
     if user.preferences:
         current = _deep_merge(current, user.preferences)
     return current
 
 
 async def _compute_activity_stats(session: AsyncSession, user_id) -> UserActivityStats:
-    projects_result = await session.execute(
-        select(func.count(Project.id)).where(Project.created_by_id == user_id)
+    # The three aggregates are scalar subqueries of one SELECT: one round-trip instead of three.
+    projects_created = (
+        select(func.count(Project.id)).where(Project.created_by_id == user_id).scalar_subquery()
     )
-    projects_created = int(projects_result.scalar() or 0)
 
-    active_sessions_result = await session.execute(
+    active_sessions = (
         select(func.count(func.distinct(Session.id)))
         .join(SessionParticipant, SessionParticipant.session_id == Session.id)
         .where(
             SessionParticipant.user_id == user_id,
             Session.status == SessionStatus.RUNNING,
         )
+        .scalar_subquery()
     )
-    active_sessions = int(active_sessions_result.scalar() or 0)
 
-    duration_seconds_result = await session.execute(
+    duration_seconds = (
         select(
             func.coalesce(
                 func.sum(
@@ -74,20 +82,42 @@ async def _compute_activity_stats(session: AsyncSession, user_id) -> UserActivit
         )
         .join(SessionParticipant, SessionParticipant.session_id == Session.id)
         .where(SessionParticipant.user_id == user_id, Session.started_at.is_not(None))
+        .scalar_subquery()
     )
-    total_seconds = float(duration_seconds_result.scalar() or 0.0)
+
+    result = await session.execute(
+        select(
+            projects_created.label("projects_created"),
+            active_sessions.label("active_sessions"),
+            duration_seconds.label("duration_seconds"),
+        )
+    )
+    row = result.one()
+    total_seconds = float(row.duration_seconds or 0.0)
     compute_hours = round(total_seconds / 3600.0, 2)
 
     return UserActivityStats(
-        projects_created=projects_created,
-        active_sessions=active_sessions,
+        projects_created=int(row.projects_created or 0),
+        active_sessions=int(row.active_sessions or 0),
         compute_hours=compute_hours,
     )
 
 
+async def _cached_activity_stats(session: AsyncSession, user_id) -> UserActivityStats:
+    stats = activity_stats.get(user_id)
+    if stats is not None:
+        return stats
+    async with activity_stats.lock_for(user_id):
+        stats = activity_stats.get(user_id)
+        if stats is None:
+            stats = await _compute_activity_stats(session, user_id)
+            activity_stats.store(user_id, stats)
+    return stats
+
+
 async def _build_profile_response(session: AsyncSession, user: User) -> UserProfileResponse:
     preferences = _resolved_preferences(user)
-    stats = await _compute_activity_stats(session, user.id)
+    stats = await _cached_activity_stats(session, user.id)
 
     payload = {
         "id": user.id,
@@ -4,6 +4,7 @@ from typing import List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from co_sim.api.dependencies import get_current_user
@@ -11,7 +12,12 @@ from co_sim.db.session import get_db
 from co_sim.models.user import User
 from co_sim.schemas.git import GitAddRequest, GitCommitRequest, GitDiffResponse, GitStatusResponse
 from co_sim.schemas.workspace import WorkspaceCreate, WorkspaceRead, WorkspaceUpdate
-from co_sim.schemas.workspace_file import WorkspaceFileRead, WorkspaceFileRename, WorkspaceFileUpsert
+from co_sim.schemas.workspace_file import (
+    WorkspaceFileRead,
+    WorkspaceFileRename,
+    WorkspaceFileSummary,
+    WorkspaceFileUpsert,
+)
 from co_sim.services import workspaces as workspace_service
 from co_sim.services import workspace_files as workspace_file_service
 from co_sim.services import workspace_git as workspace_git_service
@@ -77,14 +83,15 @@ async def delete_workspace(
     await workspace_service.delete_workspace(session, workspace_id)
 
 
-@router.get("/{workspace_id}/files", response_model=List[WorkspaceFileRead])
+@router.get("/{workspace_id}/files", response_model=List[WorkspaceFileRead] | List[WorkspaceFileSummary])
 async def list_workspace_files(
     workspace_id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
-) -> list[WorkspaceFileRead]:
+    include_content: bool = Query(default=True),
+) -> list[WorkspaceFileRead] | list[WorkspaceFileSummary]:
     _ = current_user
-    return await workspace_file_service.list_workspace_files(session, workspace_id)
+    return await workspace_file_service.list_workspace_files(session, workspace_id, include_content=include_content)
 
 
 @router.put("/{workspace_id}/files", response_model=WorkspaceFileRead)
@@ -187,3 +194,19 @@ async def get_git_diff(
         return GitDiffResponse(diff=diff)
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/{workspace_id}/git/diff/stream")
+async def stream_git_diff(
+    workspace_id: UUID,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    staged: bool = Query(default=False),
+    path: str | None = Query(default=None),
+) -> StreamingResponse:
+    _ = current_user
+    try:
+        chunks = await workspace_git_service.git_diff_stream(session, workspace_id, staged=staged, path=path)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return StreamingResponse(chunks, media_type="text/x-diff")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Any, Dict
+from typing import Any, Dict, Literal
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -50,15 +50,38 @@ class Settings(BaseSettings):
     refresh_token_expire_minutes: int = Field(default=60 * 24 * 7)
 
     redis_url: str = Field(default="redis://localhost:6379/0")
+    redis_max_connections: int = Field(
+        default=50, description="Upper bound on pooled Redis connections per process."
+    )
+    redis_pool_timeout: float = Field(
+        default=2.0, description="Seconds a Redis command waits for a free pooled connection before failing."
+    )
+    redis_health_check_interval: int = Field(
+        default=30, description="Seconds a pooled Redis connection may idle before it is pinged on reuse."
+    )
 
     workspace_root: str = Field(default="/tmp/cosim/workspaces")
     workspace_fs_enabled: bool = Field(default=True)
 
     webrtc_signaling_url: str = Field(default="ws://localhost:3000")
     webrtc_enabled: bool = Field(default=True)
+    webrtc_hardware_encoder: bool = Field(default=True)
+    webrtc_target_size: tuple[int, int] | None = Field(
+        default=None,
+        description="(width, height) WebRTC frames are scaled to before encoding; unset streams the render size.",
+    )
+    multi_process: bool = Field(
+        default=False,
+        description="Relay simulation frames through a Redis Stream for subscribers in other processes.",
+    )
 
     rate_limit_per_minute: int = Field(default=120)
     api_cache_ttl_seconds: int = Field(default=5)
+    cache_hash_algo: Literal["xxh3", "sha256"] = Field(
+        default="xxh3",
+        description="Hash used for cache identifiers; sha256 keeps keys written by older releases readable.",
+    )
+    activity_stats_ttl_seconds: int = Field(default=10)
     login_max_attempts: int = Field(default=5)
     login_throttle_window_seconds: int = Field(default=5 * 60)
     verification_code_ttl_seconds: int = Field(default=10 * 60)
@@ -69,9 +92,8 @@ class Settings(BaseSettings):
     nats_creds_file: str | None = Field(default=None)
 
     def model_dump_for_logging(self) -> Dict[str, Any]:
-        data = self.model_dump()
-        if "jwt_secret_key" in data:
-            data["jwt_secret_key"] = "***"
+        data = self.model_dump(exclude={"jwt_secret_key"})
+        data["jwt_secret_key"] = "***"
         return data
 
     @property
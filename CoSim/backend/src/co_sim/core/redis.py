@@ -2,40 +2,93 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-import inspect
 import secrets
 from collections.abc import AsyncIterator
 from typing import Callable
 
-from redis.asyncio import Redis, from_url
+import xxhash
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import PubSub
+from redis.client import NEVER_DECODE
+from redis.commands.core import AsyncScript
 
 from co_sim.core.config import settings
 
 RedisFactory = Callable[[str], Redis]
 
 _redis_client: Redis | None = None
+_blocking_redis_client: Redis | None = None
 _redis_lock = asyncio.Lock()
 
 
 def _default_redis_factory(url: str) -> Redis:
-    return from_url(url, encoding="utf-8", decode_responses=True)
+    # Short request/response commands only: a burst past the cap waits briefly
+    # for a free connection instead of failing with "Too many connections".
+    pool = BlockingConnectionPool.from_url(
+        url,
+        encoding="utf-8",
+        decode_responses=True,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout,
+        socket_keepalive=True,
+        health_check_interval=settings.redis_health_check_interval,
+    )
+    return Redis.from_pool(pool)
+
+
+def _default_blocking_redis_factory(url: str) -> Redis:
+    # Pub/sub subscriptions and XREAD BLOCK hold a connection for as long as
+    # they listen, and their number grows with viewers and lock waiters, so
+    # they get their own unbounded pool instead of starving the capped one.
+    return Redis.from_url(
+        url,
+        encoding="utf-8",
+        decode_responses=True,
+        socket_keepalive=True,
+        health_check_interval=settings.redis_health_check_interval,
+    )
 
 
 _redis_factory: RedisFactory = _default_redis_factory
+# None: blocking consumers share the main client (set by set_redis_factory).
+_blocking_redis_factory: RedisFactory | None = _default_blocking_redis_factory
 
 _CACHE_PREFIX = "cosim:cache"
 _LOCK_PREFIX = "cosim:lock"
 _CHANNEL_PREFIX = "cosim:channel"
-
-
-def build_cache_identifier(*parts: str) -> str:
+# Waiters wake on a release message; this bounds the wait for locks that expire instead.
+_LOCK_WAIT_FALLBACK = 0.5
+
+# Check-and-delete in one step so a lock that expired and was re-acquired by
+# another holder is never deleted; the release message goes out in the same call.
+_LOCK_RELEASE_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    redis.call('del', KEYS[1])
+    redis.call('publish', ARGV[2], '1')
+    return 1
+end
+return 0
+"""
+
+_lock_release_script: AsyncScript | None = None
+
+# Cache keys need no collision resistance against an attacker, so the
+# non-cryptographic xxh3 (16 hex chars) replaces SHA-256 by default.
+# Digests are one-shot over a single buffer: no hasher object per call.
+_CACHE_DIGESTS: dict[str, Callable[[bytes], str]] = {
+    "xxh3": xxhash.xxh3_64_hexdigest,
+    "sha256": lambda data: hashlib.sha256(data).hexdigest(),
+}
+
+
+def build_cache_identifier(*parts: str | bytes) -> str:
     """Create a deterministic hashed identifier for cache entries."""
 
-    hasher = hashlib.sha256()
-    for part in parts:
-        hasher.update(part.encode("utf-8"))
-        hasher.update(b"|")
-    return hasher.hexdigest()
+    try:
+        data = ("|".join(parts) + "|").encode("utf-8")
+    except TypeError:  # some parts are already bytes
+        data = b"".join((part if isinstance(part, bytes) else part.encode("utf-8")) + b"|" for part in parts)
+    return _CACHE_DIGESTS[settings.cache_hash_algo](data)
 
 
 def _cache_key(namespace: str, identifier: str) -> str:
@@ -77,19 +130,44 @@ async def init_redis(*, force: bool = False) -> Redis:
 
 
 async def get_redis() -> Redis:
-    """Return the shared Redis client, initializing it if necessary."""
+    """Return the shared Redis client, initializing it if necessary.
+
+    The helpers below read ``_redis_client`` directly and only await
+    :func:`init_redis` when it is unset, saving a coroutine per Redis call.
+    """
 
     if _redis_client is None:
         return await init_redis()
     return _redis_client
 
 
+async def get_blocking_redis() -> Redis:
+    """Return the client for commands that hold their connection while waiting.
+
+    Use it for pub/sub subscriptions and ``XREAD BLOCK``; everything else goes
+    through :func:`get_redis`.
+    """
+
+    global _blocking_redis_client
+
+    if _blocking_redis_factory is None:
+        return _redis_client or await init_redis()
+    if _blocking_redis_client is None:
+        async with _redis_lock:
+            if _blocking_redis_client is None:
+                _blocking_redis_client = _blocking_redis_factory(settings.redis_url)
+    return _blocking_redis_client
+
+
 async def close_redis() -> None:
-    """Close the shared Redis client if it exists."""
+    """Close the shared Redis clients if they exist."""
 
-    global _redis_client
+    global _redis_client, _blocking_redis_client
 
     async with _redis_lock:
+        if _blocking_redis_client is not None:
+            await _close_client(_blocking_redis_client)
+            _blocking_redis_client = None
         if _redis_client is None:
             return
         await _close_client(_redis_client)
@@ -99,28 +177,35 @@ async def close_redis() -> None:
 async def redis_dependency() -> AsyncIterator[Redis]:
     """FastAPI dependency that yields the shared Redis client."""
 
-    client = await get_redis()
+    client = _redis_client or await init_redis()
     yield client
 
 
 async def cache_get(namespace: str, identifier: str) -> str | None:
     """Retrieve a cached value for the given namespace + identifier."""
 
-    client = await get_redis()
+    client = _redis_client or await init_redis()
     return await client.get(_cache_key(namespace, identifier))
 
 
-async def cache_set(namespace: str, identifier: str, value: str, ttl_seconds: int) -> None:
+async def cache_get_bytes(namespace: str, identifier: str) -> bytes | None:
+    """Like :func:`cache_get`, but return the raw bytes without UTF-8 decoding."""
+
+    client = _redis_client or await init_redis()
+    return await client.execute_command("GET", _cache_key(namespace, identifier), **{NEVER_DECODE: True})
+
+
+async def cache_set(namespace: str, identifier: str, value: str | bytes, ttl_seconds: int) -> None:
     """Store a cached value with an expiration."""
 
-    client = await get_redis()
+    client = _redis_client or await init_redis()
     await client.setex(_cache_key(namespace, identifier), ttl_seconds, value)
 
 
 async def cache_delete(namespace: str, identifier: str) -> None:
     """Remove a cached value."""
 
-    client = await get_redis()
+    client = _redis_client or await init_redis()
     await client.delete(_cache_key(namespace, identifier))
 
 
@@ -136,6 +221,7 @@ class RedisLock:
         blocking_timeout: float | None = 10.0,
     ) -> None:
         self._name = _lock_key(name)
+        self._release_channel = _channel_name(f"lock-release:{name}")
         self._ttl = ttl
         self._blocking = blocking
         self._blocking_timeout = blocking_timeout
@@ -143,30 +229,49 @@ class RedisLock:
         self._acquired = False
 
     async def acquire(self) -> bool:
-        client = await get_redis()
-        deadline: float | None = None
+        client = _redis_client or await init_redis()
+        if await self._try_set(client):
+            return True
+        if not self._blocking:
+            return False
+
         loop = asyncio.get_running_loop()
-        if self._blocking and self._blocking_timeout is not None:
+        deadline: float | None = None
+        if self._blocking_timeout is not None:
             deadline = loop.time() + self._blocking_timeout
 
-        while True:
-            acquired = await client.set(self._name, self._token, nx=True, ex=self._ttl)
-            if acquired:
-                self._acquired = True
-                return True
-            if not self._blocking:
-                return False
-            if deadline is not None and loop.time() >= deadline:
-                return False
-            await asyncio.sleep(0.05)
+        pubsub = (await get_blocking_redis()).pubsub()
+        await pubsub.subscribe(self._release_channel)
+        try:
+            while True:
+                # Retry after subscribing so a release in between is not missed.
+                if await self._try_set(client):
+                    return True
+                wait = _LOCK_WAIT_FALLBACK
+                if deadline is not None:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                await pubsub.get_message(ignore_subscribe_messages=True, timeout=wait)
+        finally:
+            await pubsub.unsubscribe()
+            await _close_client(pubsub)
+
+    async def _try_set(self, client: Redis) -> bool:
+        acquired = await client.set(self._name, self._token, nx=True, ex=self._ttl)
+        self._acquired = bool(acquired)
+        return self._acquired
 
     async def release(self) -> None:
         if not self._acquired:
             return
-        client = await get_redis()
-        current_value = await client.get(self._name)
-        if current_value == self._token:
-            await client.delete(self._name)
+        client = _redis_client or await init_redis()
+        await _get_lock_release_script(client)(
+            keys=[self._name],
+            args=[self._token, self._release_channel],
+            client=client,
+        )
         self._acquired = False
 
     async def __aenter__(self) -> "RedisLock":
@@ -177,48 +282,56 @@ class RedisLock:
         await self.release()
 
 
-async def publish(channel: str, message: str) -> int:
+def _get_lock_release_script(client: Redis) -> AsyncScript:
+    global _lock_release_script
+    if _lock_release_script is None:
+        _lock_release_script = client.register_script(_LOCK_RELEASE_LUA)
+    return _lock_release_script
+
+
+async def publish(channel: str, message: str | bytes) -> int:
     """Publish a message to a namespaced Redis channel."""
 
-    client = await get_redis()
+    client = _redis_client or await init_redis()
     return await client.publish(_channel_name(channel), message)
 
 
 async def subscribe(channel: str):
     """Subscribe to a namespaced channel and return the pubsub object."""
 
-    client = await get_redis()
+    client = await get_blocking_redis()
     pubsub = client.pubsub()
     await pubsub.subscribe(_channel_name(channel))
     return pubsub
 
 
 def set_redis_factory(factory: RedisFactory) -> None:
-    """Override the Redis factory (primarily for testing)."""
+    """Override the Redis factory (primarily for testing).
+
+    The client it builds also serves :func:`get_blocking_redis`.
+    """
 
-    global _redis_factory
+    global _redis_factory, _blocking_redis_factory
     _redis_factory = factory
+    _blocking_redis_factory = None
 
 
 async def reset_redis_state() -> None:
     """Reset cached state (used by tests to ensure clean setup)."""
 
-    global _redis_client, _redis_factory
+    global _redis_client, _blocking_redis_client, _redis_factory, _blocking_redis_factory
 
     async with _redis_lock:
-        if _redis_client is not None:
-            await _close_client(_redis_client)
+        for client in (_redis_client, _blocking_redis_client):
+            if client is not None:
+                await _close_client(client)
         _redis_client = None
+        _blocking_redis_client = None
         _redis_factory = _default_redis_factory
+        _blocking_redis_factory = _default_blocking_redis_factory
 
 
-async def _close_client(client: Redis) -> None:
-    """Close a Redis client, awaiting the result when necessary."""
+async def _close_client(client: Redis | PubSub) -> None:
+    """Close a Redis client or pubsub; ``aclose`` is a coroutine on both since redis-py 5.0.1."""
 
-    close_method = getattr(client, "aclose", None)
-    if close_method is None:
-        result = client.close()
-    else:
-        result = close_method()
-    if inspect.isawaitable(result):
-        await result
+    await client.aclose()
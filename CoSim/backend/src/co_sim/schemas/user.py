@@ -9,12 +9,15 @@ from pydantic import BaseModel, EmailStr, Field, field_validator
 from co_sim.schemas.base import TimestampedModel
 
 
-PLAN_CHOICES = {"free", "student", "pro", "team", "enterprise"}
+PLAN_CHOICES = frozenset({"free", "student", "pro", "team", "enterprise"})
 
 
 def _normalize_plan(value: str | None) -> str:
     if not value:
         return "free"
+    # Canonical input is the common case; only lower-case on a miss.
+    if value in PLAN_CHOICES:
+        return value
     plan = value.lower()
     if plan not in PLAN_CHOICES:
         return "free"
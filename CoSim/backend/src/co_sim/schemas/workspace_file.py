@@ -14,13 +14,16 @@ class WorkspaceFileUpsert(BaseModel):
     language: Optional[str] = Field(default=None, max_length=32)
 
 
-class WorkspaceFileRead(TimestampedModel):
+class WorkspaceFileSummary(TimestampedModel):
     workspace_id: UUID
     path: str
-    content: str
     language: Optional[str]
 
 
+class WorkspaceFileRead(WorkspaceFileSummary):
+    content: str
+
+
 class WorkspaceFileRename(BaseModel):
     source_path: str = Field(max_length=512)
     destination_path: str = Field(max_length=512)
@@ -0,0 +1,55 @@
+"""Short-lived in-process cache for the per-user activity stats on ``/users/me``."""
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from uuid import UUID
+
+from co_sim.core.config import settings
+from co_sim.schemas.user import UserActivityStats
+
+CACHE_MAX_ENTRIES = 4096
+
+# LRU of user id -> (stored_at, stats); bounded so it does not grow with every user seen.
+_cache: OrderedDict[UUID, tuple[float, UserActivityStats]] = OrderedDict()
+# One lock per user in flight, so concurrent misses compute the stats once.
+_locks: weakref.WeakValueDictionary[UUID, asyncio.Lock] = weakref.WeakValueDictionary()
+
+
+def get(user_id: UUID) -> UserActivityStats | None:
+    entry = _cache.get(user_id)
+    if entry is None:
+        return None
+    stored_at, stats = entry
+    if time.monotonic() - stored_at >= settings.activity_stats_ttl_seconds:
+        _cache.pop(user_id, None)
+        return None
+    _cache.move_to_end(user_id)
+    return stats
+
+
+def store(user_id: UUID, stats: UserActivityStats) -> None:
+    _cache[user_id] = (time.monotonic(), stats)
+    _cache.move_to_end(user_id)
+    while len(_cache) > CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+
+def lock_for(user_id: UUID) -> asyncio.Lock:
+    lock = _locks.get(user_id)
+    if lock is None:
+        lock = _locks[user_id] = asyncio.Lock()
+    return lock
+
+
+def invalidate(*user_ids: UUID | None) -> None:
+    """Drop cached stats for ``user_ids``, or for everyone when none are given."""
+
+    if not user_ids:
+        _cache.clear()
+        return
+    for user_id in user_ids:
+        if user_id is not None:
+            _cache.pop(user_id, None)
@@ -11,12 +11,12 @@ from __future__ import annotations
 import asyncio
 import json
 import os
-import uuid
+import secrets
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import Base64Bytes, BaseModel, Field
 
 from co_sim.core.redis import get_redis
 
@@ -30,7 +30,11 @@ class BuildRequest(BaseModel):
 
     workspace_id: str
     source_files: Dict[str, str] = Field(
-        ..., description="Mapping of filename -> source code content"
+        default_factory=dict, description="Mapping of filename -> source code content"
+    )
+    source_files_b64: List[Tuple[str, Base64Bytes]] = Field(
+        default_factory=list,
+        description="Ordered (filename, base64 content) pairs, written byte-for-byte without re-encoding",
     )
     compiler: str = Field(default="g++", pattern=r"^(g\+\+|clang\+\+)$")
     flags: List[str] = Field(default_factory=lambda: ["-std=c++17", "-Wall"])
@@ -53,6 +57,38 @@ class BuildResult(BaseModel):
 # Core compilation
 # ---------------------------------------------------------------------------
 
+# Compiler output kept per stream; memory per build stays bounded however much it prints.
+_OUTPUT_TAIL_BYTES = 256 * 1024
+
+
+async def _read_tail(stream: asyncio.StreamReader, limit: int = _OUTPUT_TAIL_BYTES) -> str:
+    """Drain a pipe, keeping only its last ``limit`` bytes (the end of a compiler error spew)."""
+    tail = bytearray()
+    truncated = False
+    while chunk := await stream.read(limit):
+        tail += chunk
+        if len(tail) > limit:
+            del tail[:-limit]
+            truncated = True
+    text = tail.decode("utf-8", errors="replace")
+    return f"[output truncated to the last {limit} bytes]\n{text}" if truncated else text
+
+
+def _write_sources(build_dir: Path, files: Dict[Path, str | bytes]) -> None:
+    """Create each directory once, then write every file; runs in a worker thread."""
+    for directory in {build_dir, *(file_path.parent for file_path in files)}:
+        directory.mkdir(parents=True, exist_ok=True)
+    for file_path, content in files.items():
+        # Raw fd writes skip the TextIOWrapper that write_text builds per file.
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            data = memoryview(content.encode("utf-8") if isinstance(content, str) else content)
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+
 async def compile_cpp(
     request: BuildRequest,
     build_root: str = "/tmp/cosim/builds",
@@ -64,18 +100,18 @@ async def compile_cpp(
     3. Optionally generate compile_commands.json.
     4. Return the result.
     """
-    build_dir = Path(build_root) / request.workspace_id / str(uuid.uuid4())[:8]
-    build_dir.mkdir(parents=True, exist_ok=True)
-
-    # Write source files to disk
-    source_paths: List[Path] = []
-    for filename, content in request.source_files.items():
-        file_path = build_dir / filename
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_path.write_text(content, encoding="utf-8")
-        # Only compile .cpp/.c files, not headers
-        if filename.endswith((".cpp", ".c", ".cc", ".cxx")):
-            source_paths.append(file_path)
+    build_dir = Path(build_root) / request.workspace_id / secrets.token_hex(4)
+    files: Dict[Path, str | bytes] = {
+        build_dir / filename: content for filename, content in request.source_files.items()
+    }
+    files.update((build_dir / filename, content) for filename, content in request.source_files_b64)
+
+    # Write source files to disk off the event loop
+    await asyncio.to_thread(_write_sources, build_dir, files)
+    # Only compile .cpp/.c files, not headers
+    source_paths: List[Path] = [
+        file_path for file_path in files if file_path.name.endswith((".cpp", ".c", ".cc", ".cxx"))
+    ]
 
     if not source_paths:
         return BuildResult(
@@ -104,24 +140,27 @@ async def compile_cpp(
             stderr=asyncio.subprocess.PIPE,
             cwd=str(build_dir),
         )
-        stdout_bytes, stderr_bytes = await asyncio.wait_for(
-            process.communicate(), timeout=60.0
-        )
-    except asyncio.TimeoutError:
+    except FileNotFoundError:
         return BuildResult(
             status="error",
             exit_code=-1,
-            stderr="Compilation timed out (60s limit)",
+            stderr=f"Compiler not found: {request.compiler}",
         )
-    except FileNotFoundError:
+
+    try:
+        stdout_text, stderr_text = await asyncio.wait_for(
+            asyncio.gather(_read_tail(process.stdout), _read_tail(process.stderr)), timeout=60.0
+        )
+        await process.wait()
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
         return BuildResult(
             status="error",
             exit_code=-1,
-            stderr=f"Compiler not found: {request.compiler}",
+            stderr="Compilation timed out (60s limit)",
         )
 
-    stdout_text = stdout_bytes.decode("utf-8", errors="replace")
-    stderr_text = stderr_bytes.decode("utf-8", errors="replace")
     exit_code = process.returncode or 0
 
     compile_commands = None
@@ -216,8 +255,12 @@ async def persist_build_status(
     data = {"status": status}
     if artifact:
         data["artifact"] = artifact
-    await redis.hset(_build_key(workspace_id, build_id), mapping=data)
-    await redis.expire(_build_key(workspace_id, build_id), ttl)
+    key = _build_key(workspace_id, build_id)
+    # One MULTI/EXEC round-trip: the hash never exists without its TTL.
+    pipe = redis.pipeline()
+    pipe.hset(key, mapping=data)
+    pipe.expire(key, ttl)
+    await pipe.execute()
 
 
 async def get_build_status(workspace_id: str, build_id: str) -> Dict[str, str] | None:
@@ -3,10 +3,14 @@ from __future__ import annotations
 import uuid
 from typing import Iterable
 
+from pydantic import TypeAdapter
+from redis.client import NEVER_DECODE
+
 from co_sim.core.redis import RedisLock, get_redis
 from co_sim.schemas.collab import CollabDocumentCreate, CollabDocumentRead, CollabParticipant
 
 _DOC_INDEX_KEY = "collab:documents:index"
+_DOC_LIST_ADAPTER = TypeAdapter(list[CollabDocumentRead])
 
 
 def _doc_key(document_id: uuid.UUID | str) -> str:
@@ -40,7 +44,8 @@ async def create_document(payload: CollabDocumentCreate) -> CollabDocumentRead:
 
 async def _load_document(document_id: uuid.UUID) -> CollabDocumentRead | None:
     redis = await get_redis()
-    payload = await redis.get(_doc_key(document_id))
+    # Raw bytes go straight to the JSON validator without a UTF-8 decode into str first.
+    payload = await redis.execute_command("GET", _doc_key(document_id), **{NEVER_DECODE: True})
     if not payload:
         return None
     return CollabDocumentRead.model_validate_json(payload)
@@ -51,17 +56,13 @@ async def get_document(document_id: uuid.UUID) -> CollabDocumentRead | None:
 
 
 async def get_documents(document_ids: Iterable[uuid.UUID]) -> list[CollabDocumentRead]:
+    keys = [_doc_key(document_id) for document_id in document_ids]
+    if not keys:
+        return []
     redis = await get_redis()
-    pipe = redis.pipeline()
-    ordered_ids = list(document_ids)
-    for document_id in ordered_ids:
-        pipe.get(_doc_key(document_id))
-    payloads = await pipe.execute()
-    documents: list[CollabDocumentRead] = []
-    for payload in payloads:
-        if payload:
-            documents.append(CollabDocumentRead.model_validate_json(payload))
-    return documents
+    payloads = await redis.execute_command("MGET", *keys, **{NEVER_DECODE: True})
+    # Each payload is a JSON object; splicing them into one array validates in a single call.
+    return _DOC_LIST_ADAPTER.validate_json(b"[" + b",".join(payload for payload in payloads if payload) + b"]")
 
 
 async def add_participant(document_id: uuid.UUID, participant: CollabParticipant) -> CollabDocumentRead | None:
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from uuid import UUID
 
+from pydantic import TypeAdapter
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from co_sim.models.dataset import Dataset
 from co_sim.schemas.dataset import DatasetCreate, DatasetRead, DatasetUpdate
 
+_dataset_list_adapter = TypeAdapter(list[DatasetRead])
+
 
 async def create_dataset(session: AsyncSession, payload: DatasetCreate) -> DatasetRead:
     dataset = Dataset(
@@ -27,7 +30,7 @@ async def list_datasets(session: AsyncSession, organization_id: UUID | None = No
     if organization_id:
         query = query.where(Dataset.organization_id == organization_id)
     result = await session.execute(query)
-    return [DatasetRead.model_validate(dataset) for dataset in result.scalars().all()]
+    return _dataset_list_adapter.validate_python(result.scalars().all())
 
 
 async def get_dataset(session: AsyncSession, dataset_id: UUID) -> Dataset | None:
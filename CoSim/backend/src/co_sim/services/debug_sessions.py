@@ -5,12 +5,16 @@ import os
 import shutil
 import socket
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Literal
 from uuid import UUID
 
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from co_sim.core.redis import get_redis
 from co_sim.services import workspace_fs
 
 
@@ -25,17 +29,75 @@ class DebugSession:
     command: list[str]
     process: asyncio.subprocess.Process
     working_dir: str
+    # Strong reference: the event loop only keeps weak ones to running tasks.
+    watcher: asyncio.Task[None] | None = field(default=None, repr=False)
 
 
 _DEBUG_SESSIONS: dict[str, DebugSession] = {}
 
+_PORT_RESERVATION_PREFIX = "debug:port"
+# A probed port is only at risk until the debugger binds it; the reservation is
+# deleted when the debugger exits, and the TTL only cleans up after a crash.
+_PORT_RESERVATION_TTL = 60
+_PORT_RESERVATION_ATTEMPTS = 8
+# The debuggers listen on every interface, so the probe binds the same address.
+_DEBUG_BIND_HOST = "0.0.0.0"
+
+# Delete the reservation only while it is still this session's: once it expired
+# the port may have been reserved again by another start.
+_RELEASE_PORT_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_release_port_script: AsyncScript | None = None
+
+# The service never mutates its environment or PATH, so both are resolved once
+# rather than copying os.environ and walking PATH on every spawn.
+_DEBUG_ENV = {**os.environ, "PYTHONUNBUFFERED": "1"}
+
+
+@lru_cache(maxsize=8)
+def _which(name: str) -> str | None:
+    return shutil.which(name)
+
 
 def _find_free_port() -> int:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-        sock.bind(("0.0.0.0", 0))
+        sock.bind((_DEBUG_BIND_HOST, 0))
         return sock.getsockname()[1]
 
 
+async def _reserve_free_port(debug_id: str) -> int:
+    """Probe a free port and claim it in Redis so concurrent starts never share one."""
+
+    redis = await get_redis()
+    for _ in range(_PORT_RESERVATION_ATTEMPTS):
+        port = _find_free_port()
+        key = f"{_PORT_RESERVATION_PREFIX}:{port}"
+        if await redis.set(key, debug_id, nx=True, ex=_PORT_RESERVATION_TTL):
+            return port
+    raise RuntimeError("No free debug port could be reserved")
+
+
+async def _release_port(debug_id: str, port: int) -> None:
+    redis = await get_redis()
+    await _get_release_port_script(redis)(
+        keys=[f"{_PORT_RESERVATION_PREFIX}:{port}"],
+        args=[debug_id],
+        client=redis,
+    )
+
+
+def _get_release_port_script(redis: Redis) -> AsyncScript:
+    global _release_port_script
+    if _release_port_script is None:
+        _release_port_script = redis.register_script(_RELEASE_PORT_LUA)
+    return _release_port_script
+
+
 def _resolve_debug_command(
     language: Literal["python", "cpp"],
     *,
@@ -49,7 +111,7 @@ def _resolve_debug_command(
         if not file_path:
             raise ValueError("file_path required for python debugging")
         command = [
-            shutil.which("python") or "python",
+            _which("python") or "python",
             "-m",
             "debugpy",
             "--listen",
@@ -63,13 +125,13 @@ def _resolve_debug_command(
     if not binary_path:
         raise ValueError("binary_path required for C++ debugging")
 
-    adapter = adapter or ("gdb" if shutil.which("gdbserver") else "lldb")
+    adapter = adapter or ("gdb" if _which("gdbserver") else "lldb")
     if adapter == "gdb":
-        if not shutil.which("gdbserver"):
+        if not _which("gdbserver"):
             raise ValueError("gdbserver not available")
         command = ["gdbserver", f"0.0.0.0:{port}", binary_path, *args]
     else:
-        if not shutil.which("lldb-server"):
+        if not _which("lldb-server"):
             raise ValueError("lldb-server not available")
         command = ["lldb-server", "gdbserver", f"0.0.0.0:{port}", binary_path, *args]
     return command, adapter
@@ -97,25 +159,31 @@ async def start_debug_session(
         str(workspace_fs.resolve_workspace_path(workspace_id, binary_path)) if binary_path else None
     )
 
-    debug_port = port or _find_free_port()
-    command, resolved_adapter = _resolve_debug_command(
-        language,
-        port=debug_port,
-        file_path=resolved_file_path,
-        binary_path=resolved_binary_path,
-        args=args,
-        adapter=adapter,
-    )
-
-    process = await asyncio.create_subprocess_exec(
-        *command,
-        cwd=str(root),
-        env={**os.environ, "PYTHONUNBUFFERED": "1"},
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-
     debug_id = str(uuid.uuid4())
+    reserved_port = None if port else await _reserve_free_port(debug_id)
+    debug_port = port or reserved_port
+    try:
+        command, resolved_adapter = _resolve_debug_command(
+            language,
+            port=debug_port,
+            file_path=resolved_file_path,
+            binary_path=resolved_binary_path,
+            args=args,
+            adapter=adapter,
+        )
+
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=str(root),
+            env=_DEBUG_ENV,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except BaseException:
+        if reserved_port is not None:
+            await _release_port(debug_id, reserved_port)
+        raise
+
     debug_session = DebugSession(
         debug_id=debug_id,
         session_id=session_id,
@@ -128,9 +196,23 @@ async def start_debug_session(
         working_dir=str(root),
     )
     _DEBUG_SESSIONS[debug_id] = debug_session
+    debug_session.watcher = asyncio.create_task(_reap_on_exit(debug_id, process, reserved_port))
     return debug_session
 
 
+async def _reap_on_exit(
+    debug_id: str,
+    process: asyncio.subprocess.Process,
+    reserved_port: int | None = None,
+) -> None:
+    # Nothing else reads the debugger's output: drain both pipes so it never
+    # blocks on a full pipe, and drop the entry and its port once it exits.
+    await process.communicate()
+    _DEBUG_SESSIONS.pop(debug_id, None)
+    if reserved_port is not None:
+        await _release_port(debug_id, reserved_port)
+
+
 async def stop_debug_session(debug_id: str) -> bool:
     debug_session = _DEBUG_SESSIONS.pop(debug_id, None)
     if not debug_session:
@@ -1,10 +1,37 @@
 from __future__ import annotations
 
+import math
+import secrets
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
 from co_sim.core.config import settings
 from co_sim.core.redis import get_redis
 
 _LOGIN_PREFIX = "auth:login"
 
+# Sliding window over a ZSET of attempt timestamps (ms, from the Redis clock so
+# app hosts need not agree): unlike a fixed window it cannot admit a 2x burst
+# straddling a window boundary. Returns {attempts, retry_after_ms}.
+_LOGIN_ATTEMPT_LUA = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count >= limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {count + 1, tonumber(oldest[2]) + window - now}
+end
+redis.call('ZADD', KEYS[1], now, now .. ':' .. ARGV[3])
+redis.call('PEXPIRE', KEYS[1], window)
+return {count + 1, 0}
+"""
+
+_login_attempt_script: AsyncScript | None = None
+
 
 class LoginThrottledError(Exception):
     """Raised when a login identifier exceeds the configured attempt limit."""
@@ -18,14 +45,20 @@ async def register_login_attempt(identifier: str) -> None:
     """Record an attempt and raise when exceeding configured limits."""
 
     redis = await get_redis()
-    key = f"{_LOGIN_PREFIX}:{identifier}"
-    attempts = await redis.incr(key)
-    if attempts == 1:
-        await redis.expire(key, settings.login_throttle_window_seconds)
-
+    attempts, retry_after_ms = await _get_login_attempt_script(redis)(
+        keys=[f"{_LOGIN_PREFIX}:{identifier}"],
+        args=[settings.login_throttle_window_seconds * 1000, settings.login_max_attempts, secrets.token_hex(4)],
+        client=redis,
+    )
     if attempts > settings.login_max_attempts:
-        retry_after = await redis.ttl(key)
-        raise LoginThrottledError(max(retry_after, 0))
+        raise LoginThrottledError(max(math.ceil(int(retry_after_ms) / 1000), 0))
+
+
+def _get_login_attempt_script(redis: Redis) -> AsyncScript:
+    global _login_attempt_script
+    if _login_attempt_script is None:
+        _login_attempt_script = redis.register_script(_LOGIN_ATTEMPT_LUA)
+    return _login_attempt_script
 
 
 async def reset_login_attempts(identifier: str) -> None:
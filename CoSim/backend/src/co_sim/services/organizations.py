@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from uuid import UUID
 
+from pydantic import TypeAdapter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from co_sim.models.organization import Organization
 from co_sim.schemas.organization import OrganizationCreate, OrganizationRead, OrganizationUpdate
 
+_organization_list_adapter = TypeAdapter(list[OrganizationRead])
+
 
 async def create_organization(session: AsyncSession, payload: OrganizationCreate) -> OrganizationRead:
     org = Organization(name=payload.name, slug=payload.slug, description=payload.description)
@@ -19,7 +22,7 @@ async def create_organization(session: AsyncSession, payload: OrganizationCreate
 
 async def list_organizations(session: AsyncSession) -> list[OrganizationRead]:
     result = await session.execute(select(Organization))
-    return [OrganizationRead.model_validate(org) for org in result.scalars().all()]
+    return _organization_list_adapter.validate_python(result.scalars().all())
 
 
 async def get_organization(session: AsyncSession, organization_id: UUID) -> Organization | None:
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from uuid import UUID
 
+from pydantic import TypeAdapter
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from co_sim.models.project import Project
 from co_sim.schemas.project import ProjectCreate, ProjectRead, ProjectUpdate
+from co_sim.services import activity_stats
+
+_project_list_adapter = TypeAdapter(list[ProjectRead])
 
 
 async def create_project(session: AsyncSession, payload: ProjectCreate, creator_id: UUID | None) -> ProjectRead:
@@ -22,6 +26,7 @@ async def create_project(session: AsyncSession, payload: ProjectCreate, creator_
     session.add(project)
     await session.commit()
     await session.refresh(project)
+    activity_stats.invalidate(creator_id)
     return ProjectRead.model_validate(project)
 
 
@@ -30,7 +35,7 @@ async def list_projects(session: AsyncSession, organization_id: UUID | None = No
     if organization_id:
         query = query.where(Project.organization_id == organization_id)
     result = await session.execute(query)
-    return [ProjectRead.model_validate(project) for project in result.scalars().all()]
+    return _project_list_adapter.validate_python(result.scalars().all())
 
 
 async def get_project(session: AsyncSession, project_id: UUID) -> Project | None:
@@ -47,5 +52,10 @@ async def update_project(session: AsyncSession, project: Project, payload: Proje
 
 
 async def delete_project(session: AsyncSession, project_id: UUID) -> None:
-    await session.execute(delete(Project).where(Project.id == project_id))
+    result = await session.execute(
+        delete(Project).where(Project.id == project_id).returning(Project.created_by_id)
+    )
+    created_by_ids = result.scalars().all()
     await session.commit()
+    if created_by_ids:
+        activity_stats.invalidate(*created_by_ids)
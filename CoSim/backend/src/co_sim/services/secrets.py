@@ -5,6 +5,7 @@ import hashlib
 from uuid import UUID
 
 from cryptography.fernet import Fernet
+from pydantic import TypeAdapter
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,6 +13,8 @@ from co_sim.core.config import settings
 from co_sim.models.secret import Secret
 from co_sim.schemas.secret import SecretCreate, SecretRead, SecretReveal
 
+_secret_list_adapter = TypeAdapter(list[SecretRead])
+
 
 def _build_cipher() -> Fernet:
     digest = hashlib.sha256(settings.jwt_secret_key.encode()).digest()
@@ -31,7 +34,7 @@ async def create_secret(session: AsyncSession, payload: SecretCreate) -> SecretR
 
 async def list_secrets(session: AsyncSession, workspace_id: UUID) -> list[SecretRead]:
     result = await session.execute(select(Secret).where(Secret.workspace_id == workspace_id))
-    return [SecretRead.model_validate(secret) for secret in result.scalars().all()]
+    return _secret_list_adapter.validate_python(result.scalars().all())
 
 
 async def reveal_secret(session: AsyncSession, secret_id: UUID) -> SecretReveal | None:
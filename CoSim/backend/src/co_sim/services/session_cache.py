@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-import json
 from typing import Iterable
 from uuid import UUID
 
+import orjson
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
 from co_sim.core.redis import get_redis, publish
 from co_sim.models.session import SessionStatus
 from co_sim.schemas.session import SessionRead
@@ -14,6 +18,69 @@ _WORKSPACE_KEY = "sessions:workspace"
 _STATUS_KEY = "sessions:status"
 SESSION_EVENTS_CHANNEL = "sessions:events"
 
+# KEYS[1] is the all-sessions index and KEYS[2..] the payload keys; ARGV holds
+# the workspace and status index prefixes, then (id, payload, workspace_id,
+# status) per session. Reading the previous payload and moving index membership
+# inside the script keeps concurrent writers from both acting on the same stale
+# previous value.
+_UPSERT_SESSIONS_LUA = """
+local workspace_prefix, status_prefix = ARGV[1], ARGV[2]
+for i = 2, #KEYS do
+    local base = 3 + (i - 2) * 4
+    local id, payload, workspace_id, status = ARGV[base], ARGV[base + 1], ARGV[base + 2], ARGV[base + 3]
+    local previous = redis.call('GET', KEYS[i])
+    if previous then
+        local old = cjson.decode(previous)
+        if old.workspace_id ~= workspace_id then
+            redis.call('SREM', workspace_prefix .. ':' .. old.workspace_id, id)
+        end
+        if old.status ~= status then
+            redis.call('SREM', status_prefix .. ':' .. old.status, id)
+        end
+    end
+    redis.call('SET', KEYS[i], payload)
+    redis.call('SADD', KEYS[1], id)
+    redis.call('SADD', workspace_prefix .. ':' .. workspace_id, id)
+    redis.call('SADD', status_prefix .. ':' .. status, id)
+end
+return #KEYS - 1
+"""
+
+# For listing, KEYS[1] is the all-sessions index and KEYS[2..] the indexes to
+# intersect; a missing index or payload means the cache is cold, signalled with
+# nil. The payload keys are derived in the script (ARGV[1] is their prefix),
+# which is fine on the single-node Redis this cache runs on. MGET is chunked to
+# stay under Lua's unpack() limit.
+_LIST_SESSIONS_LUA = """
+for i = 1, #KEYS do
+    if redis.call('EXISTS', KEYS[i]) == 0 then
+        return false
+    end
+end
+local ids = redis.call('SINTER', unpack(KEYS, 2))
+table.sort(ids)
+local payloads = {}
+for first = 1, #ids, 1000 do
+    local data_keys = {}
+    for i = first, math.min(first + 999, #ids) do
+        data_keys[#data_keys + 1] = ARGV[1] .. ':' .. ids[i]
+    end
+    for _, payload in ipairs(redis.call('MGET', unpack(data_keys))) do
+        if not payload then
+            return false
+        end
+        payloads[#payloads + 1] = payload
+    end
+end
+return payloads
+"""
+
+_upsert_sessions_script: AsyncScript | None = None
+_list_sessions_script: AsyncScript | None = None
+
+# Cached payloads are spliced into one JSON array and validated in a single pass.
+_SESSION_LIST_ADAPTER = TypeAdapter(list[SessionRead])
+
 
 def _session_data_key(session_id: str | UUID) -> str:
     return f"{_DATA_KEY}:{session_id}"
@@ -23,47 +90,53 @@ def _all_sessions_key() -> str:
     return _ALL_KEY
 
 
-def _workspace_key(workspace_id: UUID) -> str:
+def _workspace_key(workspace_id: UUID | str) -> str:
     return f"{_WORKSPACE_KEY}:{workspace_id}"
 
 
+def _status_value(status: SessionStatus | str) -> str:
+    return status.value if isinstance(status, SessionStatus) else str(status)
+
+
 def _status_key(status: SessionStatus | str) -> str:
-    value = status.value if isinstance(status, SessionStatus) else str(status)
-    return f"{_STATUS_KEY}:{value}"
+    return f"{_STATUS_KEY}:{_status_value(status)}"
 
 
 async def upsert_session(session_read: SessionRead, *, event_type: str = "session.updated", emit_event: bool = True) -> None:
-    redis = await get_redis()
-    session_id = str(session_read.id)
-    key = _session_data_key(session_id)
-    payload = session_read.model_dump_json()
-    previous = await redis.get(key)
-
-    pipe = redis.pipeline()
-    pipe.set(key, payload)
-    pipe.sadd(_all_sessions_key(), session_id)
-    pipe.sadd(_workspace_key(session_read.workspace_id), session_id)
-    pipe.sadd(_status_key(session_read.status), session_id)
-
-    if previous:
-        previous_model = SessionRead.model_validate_json(previous)
-        if previous_model.workspace_id != session_read.workspace_id:
-            pipe.srem(_workspace_key(previous_model.workspace_id), session_id)
-        if previous_model.status != session_read.status:
-            pipe.srem(_status_key(previous_model.status), session_id)
-
-    await pipe.execute()
+    await upsert_sessions([session_read], event_type=event_type, emit_event=emit_event)
 
-    if emit_event:
-        await publish(
-            SESSION_EVENTS_CHANNEL,
-            json.dumps({"type": event_type, "session": json.loads(payload)}),
-        )
 
+async def upsert_sessions(
+    sessions: Iterable[SessionRead],
+    *,
+    event_type: str = "session.synced",
+    emit_event: bool = False,
+) -> None:
+    """Cache ``sessions`` and move their index memberships in one atomic script call."""
+
+    sessions = list(sessions)
+    if not sessions:
+        return
 
-async def upsert_sessions(sessions: Iterable[SessionRead], *, emit_event: bool = False) -> None:
-    for session in sessions:
-        await upsert_session(session, emit_event=emit_event, event_type="session.synced")
+    redis = await get_redis()
+    keys = [_all_sessions_key()]
+    args = [_WORKSPACE_KEY, _STATUS_KEY]
+    payloads: list[str] = []
+    for session_read in sessions:
+        session_id = str(session_read.id)
+        payload = session_read.model_dump_json()
+        payloads.append(payload)
+        keys.append(_session_data_key(session_id))
+        args += (session_id, payload, str(session_read.workspace_id), _status_value(session_read.status))
+
+    await _get_upsert_sessions_script(redis)(keys=keys, args=args, client=redis)
+
+    if emit_event:
+        # Splice the already-serialized payload into the envelope instead of
+        # parsing it back only to encode it again.
+        envelope_prefix = '{"type":' + orjson.dumps(event_type).decode() + ',"session":'
+        for payload in payloads:
+            await publish(SESSION_EVENTS_CHANNEL, envelope_prefix + payload + "}")
 
 
 async def get_session(session_id: UUID) -> SessionRead | None:
@@ -79,42 +152,32 @@ async def list_sessions(
     status: SessionStatus | None = None,
 ) -> list[SessionRead] | None:
     redis = await get_redis()
-    if not await redis.exists(_all_sessions_key()):
+    filter_keys = [_workspace_key(workspace_id) if workspace_id else _all_sessions_key()]
+    if status:
+        filter_keys.append(_status_key(status))
+
+    payloads = await _get_list_sessions_script(redis)(
+        keys=[_all_sessions_key(), *filter_keys],
+        args=[_DATA_KEY],
+        client=redis,
+    )
+    if payloads is None:
         return None
 
-    candidate_ids: set[str] | None = None
+    entries = _SESSION_LIST_ADAPTER.validate_json("[" + ",".join(payloads) + "]")
+    entries.sort(key=lambda s: s.created_at)
+    return entries
+
 
-    if workspace_id:
-        workspace_key = _workspace_key(workspace_id)
-        if not await redis.exists(workspace_key):
-            return None
-        workspace_members = await redis.smembers(workspace_key)
-        candidate_ids = set(workspace_members)
-    else:
-        all_members = await redis.smembers(_all_sessions_key())
-        candidate_ids = set(all_members)
+def _get_upsert_sessions_script(redis: Redis) -> AsyncScript:
+    global _upsert_sessions_script
+    if _upsert_sessions_script is None:
+        _upsert_sessions_script = redis.register_script(_UPSERT_SESSIONS_LUA)
+    return _upsert_sessions_script
 
-    if status:
-        status_key = _status_key(status)
-        if not await redis.exists(status_key):
-            return None
-        status_members = await redis.smembers(status_key)
-        candidate_ids = {sid for sid in candidate_ids if sid in status_members}
-
-    if not candidate_ids:
-        return []
-
-    pipe = redis.pipeline()
-    ordered_ids = sorted(candidate_ids)
-    for session_id in ordered_ids:
-        pipe.get(_session_data_key(session_id))
-    payloads = await pipe.execute()
-
-    entries: list[SessionRead] = []
-    for payload in payloads:
-        if not payload:
-            return None
-        entries.append(SessionRead.model_validate_json(payload))
 
-    entries.sort(key=lambda s: s.created_at)
-    return entries
+def _get_list_sessions_script(redis: Redis) -> AsyncScript:
+    global _list_sessions_script
+    if _list_sessions_script is None:
+        _list_sessions_script = redis.register_script(_LIST_SESSIONS_LUA)
+    return _list_sessions_script
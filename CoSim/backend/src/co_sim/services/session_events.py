@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from collections import deque
 from typing import Any, Awaitable, Callable
 
+import orjson
 from redis.asyncio.client import PubSub
 
-from co_sim.core.redis import get_redis
+from co_sim.core.redis import subscribe
 from co_sim.services.session_cache import SESSION_EVENTS_CHANNEL
 
 _events: deque[dict[str, Any]] = deque(maxlen=50)
@@ -20,27 +20,27 @@ async def start_listener() -> None:
     global _listener_task, _pubsub
     if _listener_task:
         return
-    redis = await get_redis()
-    _pubsub = redis.pubsub()
-    await _pubsub.subscribe(SESSION_EVENTS_CHANNEL)
+    # Through the helper so the channel gets the same namespace publish() adds.
+    _pubsub = await subscribe(SESSION_EVENTS_CHANNEL)
 
     async def _run() -> None:
         try:
-            while True:
-                message = await _pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-                if message and message.get("type") == "message":
-                    try:
-                        data = json.loads(message.get("data"))
-                    except json.JSONDecodeError:
-                        data = {"raw": message.get("data")}
-                    await emit_event(data)
-                await asyncio.sleep(0.05)
+            # listen() blocks on the connection until a message arrives, so an
+            # idle listener does not wake up and events are handled immediately.
+            async for message in _pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    data = orjson.loads(message.get("data"))
+                except orjson.JSONDecodeError:
+                    data = {"raw": message.get("data")}
+                await emit_event(data)
         except asyncio.CancelledError:  # pragma: no cover
             raise
         finally:
             if _pubsub is not None:
                 try:
-                    await _pubsub.unsubscribe(SESSION_EVENTS_CHANNEL)
+                    await _pubsub.unsubscribe()
                     await _pubsub.close()
                 finally:
                     pass
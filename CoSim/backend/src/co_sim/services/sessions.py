@@ -3,8 +3,9 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import inspect, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from co_sim.models.session import Session, SessionParticipant, SessionStatus
 from co_sim.schemas.session import (
@@ -14,7 +15,10 @@ from co_sim.schemas.session import (
     SessionRead,
     SessionUpdate,
 )
-from co_sim.services import session_cache
+from co_sim.services import activity_stats, session_cache
+
+# Refreshing only the columns leaves an already-loaded participants collection in place.
+_SESSION_COLUMNS = tuple(attr.key for attr in Session.__mapper__.column_attrs)
 
 
 async def create_session(session: AsyncSession, payload: SessionCreate) -> SessionRead:
@@ -23,11 +27,12 @@ async def create_session(session: AsyncSession, payload: SessionCreate) -> Sessi
         session_type=payload.session_type,
         requested_gpu=payload.requested_gpu,
         details=payload.details,
+        participants=[],
     )
     session.add(db_session)
     await session.commit()
-    await session.refresh(db_session)
-    session_read = await serialize_session(session, db_session)
+    await session.refresh(db_session, attribute_names=_SESSION_COLUMNS)
+    session_read = _serialize_loaded(db_session)
     await session_cache.upsert_session(session_read, event_type="session.created")
     return session_read
 
@@ -41,20 +46,22 @@ async def list_sessions(
     if cached is not None:
         return cached
 
-    query = select(Session)
+    query = select(Session).options(selectinload(Session.participants))
     if workspace_id:
         query = query.where(Session.workspace_id == workspace_id)
     if status:
         query = query.where(Session.status == status)
     result = await session.execute(query)
     sessions = result.scalars().all()
-    serialized = [await serialize_session(session, s) for s in sessions]
+    serialized = [_serialize_loaded(s) for s in sessions]
     await session_cache.upsert_sessions(serialized, emit_event=False)
     return serialized
 
 
 async def get_session(session: AsyncSession, session_id: UUID) -> Session | None:
-    result = await session.execute(select(Session).where(Session.id == session_id))
+    result = await session.execute(
+        select(Session).options(selectinload(Session.participants)).where(Session.id == session_id)
+    )
     return result.scalar_one_or_none()
 
 
@@ -66,15 +73,16 @@ async def update_session(
     data = payload.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(db_session, field, value)
-    if "status" in data and data["status"] in {SessionStatus.RUNNING, SessionStatus.STARTING}:
-        db_session.started_at = datetime.now(timezone.utc)
-    if "status" in data and data["status"] in {SessionStatus.TERMINATED}:
-        db_session.ended_at = datetime.now(timezone.utc)
+    if "status" in data:
+        for field, value in _status_timestamps(data["status"]).items():
+            setattr(db_session, field, value)
     await session.commit()
-    await session.refresh(db_session)
-    session_read = await serialize_session(session, db_session)
-    await session_cache.upsert_session(session_read, event_type="session.updated")
-    return session_read
+    await session.refresh(db_session, attribute_names=_SESSION_COLUMNS)
+    if "participants" in inspect(db_session).unloaded:
+        session_read = await serialize_session(session, db_session)
+    else:
+        session_read = _serialize_loaded(db_session)
+    return await _publish_update(session_read, status_changed="status" in data)
 
 
 async def transition_status(
@@ -85,6 +93,41 @@ async def transition_status(
     return await update_session(session, db_session, SessionUpdate(status=status))
 
 
+async def transition_status_by_id(
+    session: AsyncSession,
+    session_id: UUID,
+    status: SessionStatus,
+) -> SessionRead | None:
+    """Move a session to ``status`` with one UPDATE ... RETURNING, or return None if it does not exist."""
+    result = await session.execute(
+        update(Session)
+        .where(Session.id == session_id)
+        .values(status=status, **_status_timestamps(status))
+        .returning(Session)
+    )
+    db_session = result.scalar_one_or_none()
+    if db_session is None:
+        await session.rollback()
+        return None
+    await session.commit()
+    return await _publish_update(await serialize_session(session, db_session), status_changed=True)
+
+
+def _status_timestamps(status: SessionStatus) -> dict[str, datetime]:
+    if status in {SessionStatus.RUNNING, SessionStatus.STARTING}:
+        return {"started_at": datetime.now(timezone.utc)}
+    if status in {SessionStatus.TERMINATED}:
+        return {"ended_at": datetime.now(timezone.utc)}
+    return {}
+
+
+async def _publish_update(session_read: SessionRead, *, status_changed: bool) -> SessionRead:
+    await session_cache.upsert_session(session_read, event_type="session.updated")
+    if status_changed:
+        activity_stats.invalidate(*(participant.user_id for participant in session_read.participants))
+    return session_read
+
+
 async def add_participant(
     session: AsyncSession,
     db_session: Session,
@@ -95,6 +138,7 @@ async def add_participant(
     await session.commit()
     await session.refresh(participant)
     participant_read = SessionParticipantRead.model_validate(participant)
+    activity_stats.invalidate(payload.user_id)
     serialized = await serialize_session(session, db_session)
     await session_cache.upsert_session(serialized, event_type="session.participant")
     return participant_read
@@ -102,6 +146,11 @@ async def add_participant(
 
 async def serialize_session(session: AsyncSession, db_session: Session) -> SessionRead:
     await session.refresh(db_session, attribute_names=["participants"])
+    return _serialize_loaded(db_session)
+
+
+def _serialize_loaded(db_session: Session) -> SessionRead:
+    """Serialize a session whose participants are already loaded, without touching the database."""
     participants = [SessionParticipantRead.model_validate(p) for p in db_session.participants]
     base = SessionRead.model_validate(db_session)
     return base.model_copy(update={"participants": participants})
@@ -114,6 +163,6 @@ async def get_session_cached(session: AsyncSession, session_id: UUID) -> Session
     db_session = await get_session(session, session_id)
     if not db_session:
         return None
-    serialized = await serialize_session(session, db_session)
+    serialized = _serialize_loaded(db_session)
     await session_cache.upsert_session(serialized, emit_event=False)
     return serialized
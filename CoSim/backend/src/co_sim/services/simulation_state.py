@@ -1,19 +1,25 @@
 """Redis-backed persistence utilities for simulator state and frame fan-out."""
 from __future__ import annotations
 
-import base64
-import json
+import asyncio
+import logging
+from dataclasses import dataclass, field
 from typing import Any
 
-from pydantic import BaseModel, Field
-from redis.asyncio.client import PubSub
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter
+from redis.client import NEVER_DECODE
 
-from co_sim.core.redis import get_redis, publish, subscribe
+from co_sim.core.redis import get_blocking_redis, get_redis
 
 _SIMULATION_INDEX_KEY = "simulations:index"
 _SIMULATION_CONFIG_KEY = "simulations:config"
 _SIMULATION_STATE_KEY = "simulations:state"
-_FRAME_CHANNEL_PREFIX = "simulations:frames"
+_FRAME_STREAM_PREFIX = "simulations:frames"
+# Frames are lossy video: the stream only keeps a short backlog for readers.
+FRAME_STREAM_MAXLEN = 16
+
+logger = logging.getLogger(__name__)
 
 
 def _config_key(session_id: str) -> str:
@@ -24,8 +30,8 @@ def _state_key(session_id: str) -> str:
     return f"{_SIMULATION_STATE_KEY}:{session_id}"
 
 
-def _frame_channel(session_id: str) -> str:
-    return f"{_FRAME_CHANNEL_PREFIX}:{session_id}"
+def _frame_stream_key(session_id: str) -> str:
+    return f"{_FRAME_STREAM_PREFIX}:{session_id}"
 
 
 class SimulationConfig(BaseModel):
@@ -51,6 +57,9 @@ class SimulationRuntimeState(BaseModel):
     data: dict[str, Any] = Field(default_factory=dict)
 
 
+_CONFIG_LIST_ADAPTER = TypeAdapter(list[SimulationConfig])
+
+
 async def persist_config(config: SimulationConfig) -> None:
     """Store simulation configuration and index membership."""
 
@@ -69,6 +78,7 @@ async def remove_simulation(session_id: str) -> None:
     pipe.srem(_SIMULATION_INDEX_KEY, session_id)
     pipe.delete(_config_key(session_id))
     pipe.delete(_state_key(session_id))
+    pipe.delete(_frame_stream_key(session_id))
     await pipe.execute()
 
 
@@ -90,17 +100,8 @@ async def list_configs() -> list[SimulationConfig]:
     if not session_ids:
         return []
 
-    pipe = redis.pipeline()
-    ordered_ids = sorted(session_ids)
-    for session_id in ordered_ids:
-        pipe.get(_config_key(session_id))
-    payloads = await pipe.execute()
-
-    configs: list[SimulationConfig] = []
-    for payload in payloads:
-        if payload:
-            configs.append(SimulationConfig.model_validate_json(payload))
-    return configs
+    payloads = await redis.mget([_config_key(session_id) for session_id in sorted(session_ids)])
+    return _CONFIG_LIST_ADAPTER.validate_json("[" + ",".join(payload for payload in payloads if payload) + "]")
 
 
 async def list_session_ids() -> list[str]:
@@ -113,6 +114,35 @@ async def list_session_ids() -> list[str]:
     return sorted(session_ids)
 
 
+async def count_sessions() -> int:
+    """Return how many simulations are registered in Redis."""
+
+    redis = await get_redis()
+    return await redis.scard(_SIMULATION_INDEX_KEY)
+
+
+def _runtime_state_json(
+    session_id: str,
+    state: dict[str, Any],
+    *,
+    status: str,
+    streaming: bool,
+) -> bytes:
+    # Written once per frame: dump the SimulationRuntimeState shape directly
+    # instead of building and serializing a model.
+    return orjson.dumps(
+        {
+            "session_id": session_id,
+            "status": status,
+            "frame": int(state.get("frame", 0) or 0),
+            "time": float(state.get("time", 0.0) or 0.0),
+            "is_streaming": streaming,
+            "data": state,
+        },
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
 async def update_state(
     session_id: str,
     state: dict[str, Any],
@@ -122,16 +152,27 @@ async def update_state(
 ) -> None:
     """Persist runtime telemetry for later inspection/resume."""
 
-    runtime_state = SimulationRuntimeState(
-        session_id=session_id,
-        status=status,
-        is_streaming=streaming,
-        frame=int(state.get("frame", 0) or 0),
-        time=float(state.get("time", 0.0) or 0.0),
-        data=state,
-    )
+    payload = _runtime_state_json(session_id, state, status=status, streaming=streaming)
     redis = await get_redis()
-    await redis.set(_state_key(session_id), runtime_state.model_dump_json())
+    await redis.set(_state_key(session_id), payload)
+
+
+async def publish_frame_and_state(
+    session_id: str,
+    frame_bytes: bytes,
+    state: dict[str, Any],
+    *,
+    status: str,
+    streaming: bool,
+) -> None:
+    """Append a frame and persist runtime telemetry in a single round-trip."""
+
+    payload = _runtime_state_json(session_id, state, status=status, streaming=streaming)
+    redis = await get_redis()
+    pipe = redis.pipeline(transaction=False)
+    pipe.xadd(_frame_stream_key(session_id), {"f": frame_bytes}, maxlen=FRAME_STREAM_MAXLEN, approximate=True)
+    pipe.set(_state_key(session_id), payload)
+    await pipe.execute()
 
 
 async def get_state(session_id: str) -> SimulationRuntimeState | None:
@@ -145,30 +186,113 @@ async def get_state(session_id: str) -> SimulationRuntimeState | None:
 
 
 async def publish_frame(session_id: str, frame_bytes: bytes) -> None:
-    """Publish a base64 encoded frame to the Redis channel."""
-
-    encoded = base64.b64encode(frame_bytes).decode("ascii")
-    await publish(_frame_channel(session_id), json.dumps({"frame": encoded}))
+    """Append raw frame bytes to the session's capped frame stream."""
 
+    redis = await get_redis()
+    await redis.xadd(
+        _frame_stream_key(session_id), {"f": frame_bytes}, maxlen=FRAME_STREAM_MAXLEN, approximate=True
+    )
 
-async def subscribe_frames(session_id: str) -> PubSub:
-    """Subscribe to the Redis channel that carries frames for a session."""
 
-    return await subscribe(_frame_channel(session_id))
+async def latest_frame_id(session_id: str) -> str:
+    """Return the id of the newest buffered frame, for starting :func:`read_frames`."""
 
+    redis = await get_redis()
+    # Entries carry binary frames, so skip decoding and decode only the id.
+    entries = await redis.execute_command(
+        "XREVRANGE", _frame_stream_key(session_id), "+", "-", "COUNT", 1, **{NEVER_DECODE: True}
+    )
+    return entries[0][0].decode() if entries else "0-0"
 
-async def close_frame_subscription(pubsub: PubSub) -> None:
-    """Unsubscribe and close a pubsub client."""
 
+async def read_frames(
+    session_id: str,
+    last_id: str,
+    *,
+    count: int = 8,
+    block_ms: int = 1000,
+) -> list[tuple[str, bytes]]:
+    """Block until frames newer than ``last_id`` arrive, oldest first.
+
+    Start from :func:`latest_frame_id` to skip the backlog, then pass the id of
+    the last frame received. Returns an empty list if ``block_ms`` elapses.
+    """
+
+    redis = await get_blocking_redis()
+    # Frames are binary, so skip the client's UTF-8 response decoding.
+    response = await redis.execute_command(
+        "XREAD", "COUNT", count, "BLOCK", block_ms, "STREAMS", _frame_stream_key(session_id), last_id,
+        **{NEVER_DECODE: True},
+    )
+    if not response:
+        return []
+    _, entries = response[0]
+    return [(entry_id.decode(), fields[b"f"]) for entry_id, fields in entries]
+
+
+@dataclass
+class _FrameReader:
+    task: asyncio.Task[None]
+    queues: set[asyncio.Queue[bytes]] = field(default_factory=set)
+
+
+# One blocking XREAD per session in this process, fanned out to its local subscribers.
+_frame_readers: dict[str, _FrameReader] = {}
+
+
+def _offer_frame(queue: asyncio.Queue[bytes], frame_bytes: bytes) -> None:
+    if queue.full():
+        queue.get_nowait()  # a slow subscriber only loses its own stale frames
+    queue.put_nowait(frame_bytes)
+
+
+async def _pump_frames(session_id: str, queues: set[asyncio.Queue[bytes]]) -> None:
+    last_id: str | None = None
+    while True:
+        try:
+            if last_id is None:
+                last_id = await latest_frame_id(session_id)
+            frames = await read_frames(session_id, last_id)
+        except Exception as exc:  # keep the shared reader alive for every subscriber
+            logger.error("Frame stream read failed for session %s: %s", session_id, exc)
+            await asyncio.sleep(1.0)
+            continue
+        if frames:
+            last_id, frame_bytes = frames[-1]
+            for queue in queues:
+                _offer_frame(queue, frame_bytes)
+
+
+def subscribe_frames(session_id: str, *, maxsize: int = 2) -> asyncio.Queue[bytes]:
+    """Attach a queue receiving the newest relayed frames for ``session_id``.
+
+    The first subscriber starts the session's reader; later ones share it.
+    """
+
+    queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=maxsize)
+    reader = _frame_readers.get(session_id)
+    if reader is None:
+        queues: set[asyncio.Queue[bytes]] = set()
+        reader = _FrameReader(asyncio.create_task(_pump_frames(session_id, queues)), queues)
+        _frame_readers[session_id] = reader
+    reader.queues.add(queue)
+    return queue
+
+
+async def unsubscribe_frames(session_id: str, queue: asyncio.Queue[bytes]) -> None:
+    """Detach ``queue``; the last subscriber stops the session's reader."""
+
+    reader = _frame_readers.get(session_id)
+    if reader is None:
+        return
+    reader.queues.discard(queue)
+    if reader.queues:
+        return
+    del _frame_readers[session_id]
+    reader.task.cancel()
     try:
-        await pubsub.unsubscribe()
-    finally:
-        await pubsub.close()
-
-
-def decode_frame_message(message: str) -> bytes:
-    """Decode a frame payload published by :func:`publish_frame`."""
-
-    data = json.loads(message)
-    frame_value = data.get("frame", "")
-    return base64.b64decode(frame_value)
+        await reader.task
+    except asyncio.CancelledError:
+        pass
+    except Exception as exc:  # the caller is tearing down; never let the reader's failure escape
+        logger.error("Frame reader for session %s failed: %s", session_id, exc)
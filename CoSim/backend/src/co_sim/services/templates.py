@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from uuid import UUID
 
+from pydantic import TypeAdapter
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from co_sim.models.template import Template
 from co_sim.schemas.template import TemplateCreate, TemplateRead, TemplateUpdate
 
+_template_list_adapter = TypeAdapter(list[TemplateRead])
+
 
 async def create_template(session: AsyncSession, payload: TemplateCreate) -> TemplateRead:
     template = Template(
@@ -27,7 +30,7 @@ async def list_templates(session: AsyncSession, kind: str | None = None) -> list
     if kind:
         query = query.where(Template.kind == kind)
     result = await session.execute(query)
-    return [TemplateRead.model_validate(template) for template in result.scalars().all()]
+    return _template_list_adapter.validate_python(result.scalars().all())
 
 
 async def get_template(session: AsyncSession, template_id: UUID) -> Template | None:
@@ -113,15 +113,23 @@ class TerminalSession:
             raise RuntimeError("Terminal not started")
         os.write(self._master_fd, data.encode("utf-8"))
 
-    async def read(self, size: int = 4096) -> str:
-        """Read available output from the terminal."""
+    async def read(self, size: int = 65536, timeout: float | None = None) -> str:
+        """Read available output from the terminal.
+
+        Waits on PTY readiness until output arrives. Returns ``""`` at EOF, or
+        when ``timeout`` is given and elapses without output.
+        """
+        data = await self.read_bytes(size, timeout=timeout)
+        return data.decode("utf-8", errors="replace")
+
+    async def read_bytes(self, size: int = 65536, timeout: float | None = None) -> bytes:
+        """Like :meth:`read`, but returns the raw PTY bytes without decoding."""
         if self._reader is None:
             raise RuntimeError("Terminal not started")
         try:
-            data = await asyncio.wait_for(self._reader.read(size), timeout=1.0)
-            return data.decode("utf-8", errors="replace")
+            return await asyncio.wait_for(self._reader.read(size), timeout=timeout)
         except asyncio.TimeoutError:
-            return ""
+            return b""
 
     async def read_until(self, marker: str, timeout: float = 5.0) -> str:
         """Read output until a marker string is found or timeout."""
@@ -2,21 +2,39 @@ from __future__ import annotations
 
 from uuid import UUID
 
+from pydantic import TypeAdapter
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from co_sim.models.workspace_file import WorkspaceFile
-from co_sim.schemas.workspace_file import WorkspaceFileRead, WorkspaceFileUpsert
+from co_sim.schemas.workspace_file import WorkspaceFileRead, WorkspaceFileSummary, WorkspaceFileUpsert
 from co_sim.services import workspace_fs
 from co_sim.core.config import settings
 
-
-async def list_workspace_files(session: AsyncSession, workspace_id: UUID) -> list[WorkspaceFileRead]:
-    result = await session.execute(
-        select(WorkspaceFile).where(WorkspaceFile.workspace_id == workspace_id).order_by(WorkspaceFile.path)
-    )
-    files = result.scalars().all()
-    return [WorkspaceFileRead.model_validate(file) for file in files]
+_file_list_adapter = TypeAdapter(list[WorkspaceFileRead])
+_file_summary_list_adapter = TypeAdapter(list[WorkspaceFileSummary])
+
+
+async def list_workspace_files(
+    session: AsyncSession, workspace_id: UUID, include_content: bool = True
+) -> list[WorkspaceFileRead] | list[WorkspaceFileSummary]:
+    query = select(WorkspaceFile).where(WorkspaceFile.workspace_id == workspace_id).order_by(WorkspaceFile.path)
+    if not include_content:
+        # Tree polling only needs paths; leave the content blobs on the server.
+        query = query.options(
+            load_only(
+                WorkspaceFile.id,
+                WorkspaceFile.workspace_id,
+                WorkspaceFile.path,
+                WorkspaceFile.language,
+                WorkspaceFile.created_at,
+                WorkspaceFile.updated_at,
+            )
+        )
+    result = await session.execute(query)
+    adapter = _file_list_adapter if include_content else _file_summary_list_adapter
+    return adapter.validate_python(result.scalars().all())
 
 
 async def get_workspace_file(session: AsyncSession, workspace_id: UUID, path: str) -> WorkspaceFile | None:
@@ -133,4 +151,4 @@ async def rename_workspace_path(
         except Exception:  # pragma: no cover - best effort sync
             pass
 
-    return [WorkspaceFileRead.model_validate(file) for file in files]
+    return _file_list_adapter.validate_python(files)
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from co_sim.services import workspace_fs
 
+logger = logging.getLogger(__name__)
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+
 
 @dataclass
 class GitStatusEntry:
@@ -78,6 +83,15 @@ async def git_commit(session: AsyncSession, workspace_id: UUID | str, message: s
     return output
 
 
+def _diff_args(staged: bool, path: str | None) -> list[str]:
+    args = ["diff"]
+    if staged:
+        args.append("--cached")
+    if path:
+        args.extend(["--", path])
+    return args
+
+
 async def git_diff(
     session: AsyncSession,
     workspace_id: UUID | str,
@@ -86,9 +100,40 @@ async def git_diff(
     path: str | None = None,
 ) -> str:
     root = await ensure_repo(session, workspace_id)
-    args = ["diff"]
-    if staged:
-        args.append("--cached")
-    if path:
-        args.extend(["--", path])
-    return await _run_git(root, args)
+    return await _run_git(root, _diff_args(staged, path))
+
+
+async def _stream_stdout(process: asyncio.subprocess.Process) -> AsyncIterator[bytes]:
+    try:
+        while chunk := await process.stdout.read(_STREAM_CHUNK_SIZE):
+            yield chunk
+        if await process.wait() != 0:
+            # Headers are already sent, so a late failure can only be logged.
+            logger.warning("git diff exited with status %s", process.returncode)
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+
+async def git_diff_stream(
+    session: AsyncSession,
+    workspace_id: UUID | str,
+    *,
+    staged: bool = False,
+    path: str | None = None,
+) -> AsyncIterator[bytes]:
+    """Start ``git diff`` and return an iterator over its stdout.
+
+    Repository setup happens before this returns, so setup errors still raise
+    ``RuntimeError`` while the caller can turn them into an error response.
+    """
+    root = await ensure_repo(session, workspace_id)
+    process = await asyncio.create_subprocess_exec(
+        "git",
+        *_diff_args(staged, path),
+        cwd=root,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    return _stream_stdout(process)
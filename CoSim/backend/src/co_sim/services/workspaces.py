@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from uuid import UUID
 
+from pydantic import TypeAdapter
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from co_sim.models.workspace import Workspace, WorkspaceStatus
 from co_sim.schemas.workspace import WorkspaceCreate, WorkspaceRead, WorkspaceUpdate
 
+_workspace_list_adapter = TypeAdapter(list[WorkspaceRead])
+
 
 async def create_workspace(session: AsyncSession, payload: WorkspaceCreate) -> WorkspaceRead:
     workspace = Workspace(
@@ -29,7 +32,7 @@ async def list_workspaces(session: AsyncSession, project_id: UUID | None = None)
     if project_id:
         query = query.where(Workspace.project_id == project_id)
     result = await session.execute(query)
-    return [WorkspaceRead.model_validate(workspace) for workspace in result.scalars().all()]
+    return _workspace_list_adapter.validate_python(result.scalars().all())
 
 
 async def get_workspace(session: AsyncSession, workspace_id: UUID) -> Workspace | None:
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+
+from co_sim.core.config import settings
+from co_sim.schemas.user import UserActivityStats
+from co_sim.services import activity_stats
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    activity_stats.invalidate()
+    yield
+    activity_stats.invalidate()
+
+
+def test_activity_stats_expire_after_ttl(monkeypatch):
+    user_id = uuid4()
+    stats = UserActivityStats(projects_created=1, active_sessions=0, compute_hours=0.5)
+    activity_stats.store(user_id, stats)
+    assert activity_stats.get(user_id) is stats
+
+    monkeypatch.setattr(settings, "activity_stats_ttl_seconds", 0)
+    assert activity_stats.get(user_id) is None
+
+
+def test_activity_stats_invalidate_targets_users():
+    first, second = uuid4(), uuid4()
+    stats = UserActivityStats(projects_created=0, active_sessions=0, compute_hours=0.0)
+    activity_stats.store(first, stats)
+    activity_stats.store(second, stats)
+
+    activity_stats.invalidate(first, None)
+    assert activity_stats.get(first) is None
+    assert activity_stats.get(second) is stats
+
+    activity_stats.invalidate()
+    assert activity_stats.get(second) is None
+
+
+def test_activity_stats_lock_is_shared_per_user():
+    user_id = uuid4()
+    lock = activity_stats.lock_for(user_id)
+    assert activity_stats.lock_for(user_id) is lock
+    assert activity_stats.lock_for(uuid4()) is not lock
+
+
+def test_activity_stats_evict_least_recently_used(monkeypatch):
+    monkeypatch.setattr(activity_stats, "CACHE_MAX_ENTRIES", 2)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    stats = UserActivityStats(projects_created=0, active_sessions=0, compute_hours=0.0)
+    activity_stats.store(first, stats)
+    activity_stats.store(second, stats)
+    assert activity_stats.get(first) is stats  # first is now the most recent
+
+    activity_stats.store(third, stats)
+    assert activity_stats.get(second) is None
+    assert activity_stats.get(first) is stats
+    assert activity_stats.get(third) is stats
@@ -4,11 +4,14 @@ import os
 
 import httpx
 import pytest
+import pytest_asyncio
 from fakeredis.aioredis import FakeRedis
 from fastapi import HTTPException
 from starlette.requests import Request
 
+from co_sim.agents.api_gateway import client as gateway_client
 from co_sim.agents.api_gateway.client import forward_request
+from co_sim.agents.api_gateway import dependencies as gateway_dependencies
 from co_sim.agents.api_gateway.dependencies import enforce_rate_limit
 from co_sim.core import redis as redis_helpers
 from co_sim.core.config import settings
@@ -16,23 +19,27 @@ from co_sim.core.config import settings
 os.environ.setdefault("COSIM_JWT_SECRET_KEY", "x" * 32)
 
 
-def _build_request(method: str = "GET") -> Request:
+def _build_request(method: str = "GET", headers: list[tuple[bytes, bytes]] | None = None) -> Request:
     scope = {
         "type": "http",
         "method": method,
         "path": "/test",
-        "headers": [],
+        "headers": headers or [],
         "client": ("127.0.0.1", 1234),
     }
     return Request(scope)
 
 
-@pytest.fixture(autouse=True)
+@pytest_asyncio.fixture(autouse=True)
 async def _reset_redis_state():
     await redis_helpers.reset_redis_state()
     redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
     await redis_helpers.init_redis(force=True)
+    gateway_dependencies._blocked_until.clear()
+    gateway_client._local_cache.clear()
     yield
+    gateway_dependencies._blocked_until.clear()
+    gateway_client._local_cache.clear()
     await redis_helpers.reset_redis_state()
 
 
@@ -61,6 +68,49 @@ async def test_forward_request_caches_get(monkeypatch):
     assert resp2.headers["X-Cache"] == "HIT"
 
 
+@pytest.mark.asyncio
+async def test_forward_request_caches_binary_bodies(monkeypatch):
+    body = bytes(range(256))
+
+    async def fake_request(self, method, url, **kwargs):  # noqa: ANN001
+        return httpx.Response(status_code=200, content=body, headers={"content-type": "application/octet-stream"})
+
+    monkeypatch.setattr(httpx.AsyncClient, "request", fake_request)
+
+    request = _build_request()
+    await forward_request(request, "auth", "/v1/blob")
+    gateway_client._local_cache.clear()
+    cached = await forward_request(request, "auth", "/v1/blob")
+
+    assert cached.headers["X-Cache"] == "HIT"
+    assert cached.content == body
+
+
+@pytest.mark.asyncio
+async def test_forward_request_serves_local_cache_without_redis(monkeypatch):
+    call_count = 0
+
+    async def fake_request(self, method, url, **kwargs):  # noqa: ANN001
+        nonlocal call_count
+        call_count += 1
+        return httpx.Response(status_code=200, content=b"{\"ok\": 1}", headers={"content-type": "application/json"})
+
+    monkeypatch.setattr(httpx.AsyncClient, "request", fake_request)
+
+    request = _build_request()
+    await forward_request(request, "auth", "/v1/local")
+
+    async def fail_cache_get(*args, **kwargs):  # noqa: ANN002, ANN003
+        raise AssertionError("local cache hit should not reach Redis")
+
+    monkeypatch.setattr(gateway_client, "cache_get_bytes", fail_cache_get)
+    cached = await forward_request(request, "auth", "/v1/local")
+
+    assert call_count == 1
+    assert cached.json() == {"ok": 1}
+    assert cached.headers["X-Cache"] == "HIT"
+
+
 @pytest.mark.asyncio
 async def test_enforce_rate_limit_blocks_after_threshold(monkeypatch):
     monkeypatch.setattr(settings, "rate_limit_per_minute", 2)
@@ -75,3 +125,71 @@ async def test_enforce_rate_limit_blocks_after_threshold(monkeypatch):
 
     assert exc.value.status_code == 429
     assert exc.value.detail["message"] == "Rate limit exceeded"
+    assert 0 < exc.value.detail["retry_after"] <= 60
+
+
+@pytest.mark.asyncio
+async def test_enforce_rate_limit_short_circuits_blocked_identifiers(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_per_minute", 1)
+    # A dedicated client address keeps this test independent of other rate-limit tests.
+    fake_request = _build_request(headers=[(b"x-forwarded-for", b"203.0.113.7")])
+    fake_redis = FakeRedis(decode_responses=True)
+    assert "203.0.113.7" not in gateway_dependencies._blocked_until
+
+    await enforce_rate_limit(fake_request, fake_redis)
+    with pytest.raises(HTTPException):
+        await enforce_rate_limit(fake_request, fake_redis)
+
+    await fake_redis.flushall()
+    with pytest.raises(HTTPException) as exc:
+        await enforce_rate_limit(fake_request, fake_redis)
+
+    assert exc.value.status_code == 429
+    assert await fake_redis.dbsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_forward_request_only_forwards_allowed_headers(monkeypatch):
+    forwarded: dict[str, str] = {}
+
+    async def fake_request(self, method, url, **kwargs):  # noqa: ANN001
+        forwarded.update(kwargs["headers"])
+        return httpx.Response(status_code=200, content=b"{}", headers={"content-type": "application/json"})
+
+    monkeypatch.setattr(httpx.AsyncClient, "request", fake_request)
+
+    request = _build_request(
+        "POST",
+        headers=[(b"authorization", b"Bearer abc"), (b"x-request-id", b"req-1"), (b"cookie", b"secret=1")],
+    )
+    await forward_request(request, "auth", "/v1/sample", method="POST", json={})
+
+    assert forwarded == {"authorization": "Bearer abc", "x-request-id": "req-1"}
+
+
+@pytest.mark.asyncio
+async def test_forward_request_rejects_unknown_service():
+    with pytest.raises(HTTPException) as exc:
+        await forward_request(_build_request(), "unknown", "/v1/sample")
+
+    assert exc.value.status_code == 500
+    assert exc.value.detail == "Service not configured"
+
+
+@pytest.mark.asyncio
+async def test_forward_request_reuses_shared_client(monkeypatch):
+    seen_clients: list[httpx.AsyncClient] = []
+
+    async def fake_request(self, method, url, **kwargs):  # noqa: ANN001
+        seen_clients.append(self)
+        return httpx.Response(status_code=200, content=b"{}", headers={"content-type": "application/json"})
+
+    monkeypatch.setattr(httpx.AsyncClient, "request", fake_request)
+
+    request = _build_request("POST")
+    await forward_request(request, "auth", "/v1/sample", method="POST", json={})
+    await forward_request(request, "auth", "/v1/sample", method="POST", json={})
+
+    assert len(seen_clients) == 2
+    assert seen_clients[0] is seen_clients[1]
+    await gateway_client.close_http_client()
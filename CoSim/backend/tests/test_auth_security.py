@@ -3,10 +3,9 @@ from __future__ import annotations
 import os
 from uuid import uuid4
 
-import asyncio
-import time
-
 import pytest
+import pytest_asyncio
+from fakeredis.aioredis import FakeRedis
 
 os.environ.setdefault("COSIM_JWT_SECRET_KEY", "x" * 32)
 
@@ -17,71 +16,11 @@ from co_sim.services import refresh_tokens, verification_codes
 from co_sim.services import token as token_service
 
 
-class InMemoryRedis:
-    def __init__(self) -> None:
-        self.store: dict[str, str | int] = {}
-        self.expirations: dict[str, float] = {}
-        self._lock = asyncio.Lock()
-
-    async def ping(self) -> bool:
-        return True
-
-    async def close(self) -> None:
-        return None
-
-    async def incr(self, key: str) -> int:
-        async with self._lock:
-            value = int(self.store.get(key, 0)) + 1
-            self.store[key] = value
-            return value
-
-    async def expire(self, key: str, ttl: int) -> bool:
-        async with self._lock:
-            self.expirations[key] = time.time() + ttl
-            return True
-
-    async def ttl(self, key: str) -> int:
-        exp = self.expirations.get(key)
-        if exp is None:
-            return -2
-        remaining = int(exp - time.time())
-        return remaining if remaining > 0 else -2
-
-    async def delete(self, key: str) -> int:
-        async with self._lock:
-            existed = 1 if key in self.store else 0
-            self.store.pop(key, None)
-            self.expirations.pop(key, None)
-            return existed
-
-    async def setex(self, key: str, ttl: int, value: str) -> bool:
-        async with self._lock:
-            self.store[key] = value
-            self.expirations[key] = time.time() + ttl
-            return True
-
-    async def get(self, key: str) -> str | None:
-        async with self._lock:
-            exp = self.expirations.get(key)
-            if exp is not None and exp < time.time():
-                self.store.pop(key, None)
-                self.expirations.pop(key, None)
-                return None
-            value = self.store.get(key)
-            return str(value) if value is not None else None
-
-    async def exists(self, key: str) -> int:
-        return 1 if await self.get(key) is not None else 0
-
-
-@pytest.fixture(autouse=True)
+@pytest_asyncio.fixture(autouse=True)
 async def _mock_redis():
     await redis_helpers.reset_redis_state()
-
-    def factory(_: str) -> InMemoryRedis:
-        return InMemoryRedis()
-
-    redis_helpers.set_redis_factory(factory)
+    # FakeRedis runs the Lua scripts the login throttle relies on.
+    redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
     await redis_helpers.init_redis(force=True)
     yield
     await redis_helpers.reset_redis_state()
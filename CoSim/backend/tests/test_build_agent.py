@@ -6,6 +6,7 @@ before the implementation exists.
 from __future__ import annotations
 
 import asyncio
+import base64
 import os
 import textwrap
 
@@ -179,6 +180,9 @@ async def test_build_state_persisted_in_redis():
     assert state["status"] == "success"
     assert state["artifact"] == "/tmp/out"
 
+    client = await redis_helpers.get_redis()
+    assert 0 < await client.ttl("cosim:build:ws-1:build-abc") <= 3600
+
 
 @pytest.mark.asyncio
 async def test_multi_file_build(tmp_path):
@@ -211,3 +215,39 @@ async def test_multi_file_build(tmp_path):
     result = await compile_cpp(req, build_root=str(tmp_path))
     assert result.status == "success"
     assert result.exit_code == 0
+
+
+@pytest.mark.asyncio
+async def test_build_from_base64_sources(tmp_path):
+    """Base64 sources are decoded during validation and written verbatim."""
+    from co_sim.services.build_agent import BuildRequest, compile_cpp
+
+    header = b"#define GREETING \"caf\xc3\xa9\"\n"
+    main = b"#include \"greeting.h\"\n#include <cstdio>\nint main() { std::puts(GREETING); }\n"
+    req = BuildRequest(
+        workspace_id="ws-b64",
+        source_files_b64=[
+            ("greeting.h", base64.b64encode(header).decode()),
+            ("main.cpp", base64.b64encode(main).decode()),
+        ],
+        output_name="b64_test",
+    )
+    assert req.source_files_b64[0] == ("greeting.h", header)
+
+    result = await compile_cpp(req, build_root=str(tmp_path))
+    assert result.status == "success"
+    assert next((tmp_path / "ws-b64").rglob("greeting.h")).read_bytes() == header
+
+
+@pytest.mark.asyncio
+async def test_read_tail_keeps_last_bytes():
+    from co_sim.services.build_agent import _read_tail
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(b"a" * 100 + b"END")
+    reader.feed_eof()
+
+    text = await _read_tail(reader, limit=10)
+
+    assert text.endswith("aaaaaaaEND")
+    assert text.startswith("[output truncated")
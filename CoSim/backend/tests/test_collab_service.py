@@ -59,3 +59,16 @@ async def test_add_participant_replaces_existing():
     assert updated is not None
     assert len(updated.participants) == 1
     assert updated.participants[0].role == "editor"
+
+
+@pytest.mark.asyncio
+async def test_get_documents_skips_missing_and_keeps_order():
+    workspace_id = uuid.uuid4()
+    first = await collab.create_document(CollabDocumentCreate(workspace_id=workspace_id, name="First"))
+    second = await collab.create_document(CollabDocumentCreate(workspace_id=workspace_id, name="Second"))
+
+    documents = await collab.get_documents([second.document_id, uuid.uuid4(), first.document_id])
+
+    assert [doc.name for doc in documents] == ["Second", "First"]
+    assert await collab.get_documents([]) == []
+    assert await collab.get_documents([uuid.uuid4()]) == []
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from co_sim.core import redis as redis_helpers
+from co_sim.services import debug_sessions
+
+
+@pytest.mark.asyncio
+async def test_exited_debugger_is_reaped():
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        "import sys; sys.stdout.write('x' * 200_000); sys.stderr.write('y' * 200_000)",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    debug_sessions._DEBUG_SESSIONS["dead"] = debug_sessions.DebugSession(
+        debug_id="dead",
+        session_id="session",
+        workspace_id="workspace",
+        language="python",
+        adapter=None,
+        port=0,
+        command=[],
+        process=process,
+        working_dir=".",
+    )
+
+    await asyncio.wait_for(debug_sessions._reap_on_exit("dead", process), timeout=10)
+
+    assert process.returncode == 0
+    assert debug_sessions.get_debug_session("dead") is None
+
+
+@pytest.mark.asyncio
+async def test_reserved_port_is_not_handed_out_twice(monkeypatch):
+    await redis_helpers.reset_redis_state()
+    redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
+    ports = iter([40001, 40001, 40002])
+    monkeypatch.setattr(debug_sessions, "_find_free_port", lambda: next(ports))
+    try:
+        assert await debug_sessions._reserve_free_port("first") == 40001
+        assert await debug_sessions._reserve_free_port("second") == 40002
+
+        # Only the holder's release deletes a reservation.
+        redis = await redis_helpers.get_redis()
+        await debug_sessions._release_port("second", 40001)
+        assert await redis.get("debug:port:40001") == "first"
+        await debug_sessions._release_port("first", 40001)
+        assert not await redis.exists("debug:port:40001")
+    finally:
+        await redis_helpers.reset_redis_state()
+
+
+@pytest.mark.asyncio
+async def test_reaping_a_debugger_releases_its_port():
+    await redis_helpers.reset_redis_state()
+    redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
+    try:
+        port = await debug_sessions._reserve_free_port("reaped")
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", "pass", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+
+        await asyncio.wait_for(debug_sessions._reap_on_exit("reaped", process, port), timeout=10)
+
+        redis = await redis_helpers.get_redis()
+        assert not await redis.exists(f"debug:port:{port}")
+    finally:
+        await redis_helpers.reset_redis_state()
@@ -4,14 +4,16 @@ import asyncio
 import os
 
 import pytest
+import pytest_asyncio
 from fakeredis.aioredis import FakeRedis
+from redis.asyncio import BlockingConnectionPool
 
 os.environ.setdefault("COSIM_JWT_SECRET_KEY", "x" * 32)
 
 from co_sim.core import redis as redis_helpers
 
 
-@pytest.fixture(autouse=True)
+@pytest_asyncio.fixture(autouse=True)
 async def reset_redis_state() -> None:
     await redis_helpers.reset_redis_state()
     yield
@@ -80,6 +82,26 @@ async def test_cache_helpers_round_trip():
     assert await redis_helpers.cache_get("tests", identifier) is None
 
 
+def test_build_cache_identifier_algorithms(monkeypatch):
+    identifier = redis_helpers.build_cache_identifier("foo", b"bar")
+    assert len(identifier) == 16
+    assert identifier == redis_helpers.build_cache_identifier(b"foo", "bar")
+
+    monkeypatch.setattr(redis_helpers.settings, "cache_hash_algo", "sha256")
+    assert len(redis_helpers.build_cache_identifier("foo", b"bar")) == 64
+
+
+@pytest.mark.asyncio
+async def test_cache_bytes_helpers_skip_decoding():
+    redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
+    await redis_helpers.init_redis(force=True)
+
+    await redis_helpers.cache_set("tests", "raw", b"\xff\x00", ttl_seconds=30)
+
+    assert await redis_helpers.cache_get_bytes("tests", "raw") == b"\xff\x00"
+    assert await redis_helpers.cache_get_bytes("tests", "missing") is None
+
+
 @pytest.mark.asyncio
 async def test_redis_lock_acquire_release():
     redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
@@ -97,6 +119,42 @@ async def test_redis_lock_acquire_release():
     await lock_secondary.release()
 
 
+@pytest.mark.asyncio
+async def test_redis_lock_release_keeps_other_holders_lock():
+    client = FakeRedis(decode_responses=True)
+    redis_helpers.set_redis_factory(lambda _: client)
+    await redis_helpers.init_redis(force=True)
+
+    stale = redis_helpers.RedisLock("expired", ttl=5)
+    assert await stale.acquire()
+    # Simulate the TTL lapsing and another worker taking the lock.
+    await client.set("cosim:lock:expired", "other-token")
+
+    await stale.release()
+    assert await client.get("cosim:lock:expired") == "other-token"
+
+
+@pytest.mark.asyncio
+async def test_redis_lock_waiter_wakes_on_release():
+    redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
+    await redis_helpers.init_redis(force=True)
+
+    holder = redis_helpers.RedisLock("contended", ttl=5)
+    assert await holder.acquire()
+
+    waiter = redis_helpers.RedisLock("contended", ttl=5, blocking_timeout=2.0)
+    waiting = asyncio.create_task(waiter.acquire())
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+
+    loop = asyncio.get_running_loop()
+    released_at = loop.time()
+    await holder.release()
+    assert await asyncio.wait_for(waiting, timeout=1.0)
+    assert loop.time() - released_at < redis_helpers._LOCK_WAIT_FALLBACK
+    await waiter.release()
+
+
 @pytest.mark.asyncio
 async def test_publish_and_subscribe_roundtrip():
     redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
@@ -121,3 +179,22 @@ async def test_publish_and_subscribe_roundtrip():
         await close_method()
     else:
         await pubsub.close()
+
+
+@pytest.mark.asyncio
+async def test_blocking_consumers_get_their_own_pool():
+    client = redis_helpers._default_redis_factory("redis://localhost:6379/0")
+    blocking = redis_helpers._default_blocking_redis_factory("redis://localhost:6379/0")
+    try:
+        assert isinstance(client.connection_pool, BlockingConnectionPool)
+        assert client.connection_pool.max_connections == redis_helpers.settings.redis_max_connections
+        assert client.connection_pool.timeout == redis_helpers.settings.redis_pool_timeout
+        assert not isinstance(blocking.connection_pool, BlockingConnectionPool)
+    finally:
+        await client.aclose()
+        await blocking.aclose()
+
+    # An overridden factory serves blocking consumers from the same client.
+    fake_client = FakeRedis(decode_responses=True)
+    redis_helpers.set_redis_factory(lambda _: fake_client)
+    assert await redis_helpers.get_blocking_redis() is fake_client
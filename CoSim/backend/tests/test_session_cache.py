@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from uuid import UUID, uuid4
 
 import pytest
+import pytest_asyncio
 from fakeredis.aioredis import FakeRedis
 
 from co_sim.core import redis as redis_helpers
@@ -28,7 +29,7 @@ def _session_read(*, workspace_id: UUID, status: str) -> SessionRead:
     )
 
 
-@pytest.fixture(autouse=True)
+@pytest_asyncio.fixture(autouse=True)
 async def _redis_state():
     await redis_helpers.reset_redis_state()
     redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
@@ -84,3 +85,32 @@ async def test_list_sessions_returns_none_when_missing_payload():
 
     cached = await session_cache.list_sessions()
     assert cached is None
+
+
+@pytest.mark.asyncio
+async def test_upsert_sessions_moves_index_membership():
+    workspace = uuid4()
+    session_read = _session_read(workspace_id=workspace, status="running")
+    await session_cache.upsert_session(session_read, emit_event=False)
+
+    paused = session_read.model_copy(update={"status": "paused"})
+    terminated = session_read.model_copy(update={"status": "terminated"})
+    await session_cache.upsert_sessions([paused, terminated], emit_event=False)
+
+    redis = await redis_helpers.get_redis()
+    assert not await redis.exists("sessions:status:running", "sessions:status:paused")
+    cached = await session_cache.list_sessions(status="terminated")
+    assert cached is not None and [s.id for s in cached] == [session_read.id]
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_intersects_workspace_and_status():
+    workspace = uuid4()
+    running = _session_read(workspace_id=workspace, status="running")
+    paused = _session_read(workspace_id=workspace, status="paused")
+    elsewhere = _session_read(workspace_id=uuid4(), status="running")
+    await session_cache.upsert_sessions([running, paused, elsewhere], emit_event=False)
+
+    cached = await session_cache.list_sessions(workspace_id=workspace, status="running")
+
+    assert cached is not None and [s.id for s in cached] == [running.id]
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import json
 from datetime import datetime, timezone
 from uuid import uuid4
 
 import pytest
+import pytest_asyncio
 from fakeredis.aioredis import FakeRedis
 
 os.environ.setdefault("COSIM_JWT_SECRET_KEY", "x" * 32)
@@ -17,7 +19,7 @@ from co_sim.agents.simulation import session_tracker
 from co_sim.schemas.session import SessionRead
 
 
-@pytest.fixture(autouse=True)
+@pytest_asyncio.fixture(autouse=True)
 async def _redis_state():
     await redis_helpers.reset_redis_state()
     redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
@@ -83,3 +85,19 @@ async def test_session_transition_updates_simulation_tracker(monkeypatch):
     assert session_tracker.get_active_sessions() == []
 
     session_events.unregister_handler("sim-test")
+
+
+@pytest.mark.asyncio
+async def test_listener_receives_published_session_events():
+    received = asyncio.Queue()
+    session_events.register_handler("listener", received.put_nowait)
+    await session_events.start_listener()
+
+    session_obj = _session_read(status="running")
+    await session_cache.upsert_session(session_obj, event_type="session.created")
+    event = await asyncio.wait_for(received.get(), timeout=2.0)
+
+    assert event["type"] == "session.created"
+    assert event["session"]["id"] == str(session_obj.id)
+
+    session_events.unregister_handler("listener")
@@ -0,0 +1,77 @@
+"""Service-level tests for session status transitions on an in-memory SQLite backend."""
+from __future__ import annotations
+
+import uuid
+
+import orjson
+import pytest
+import pytest_asyncio
+from fakeredis.aioredis import FakeRedis
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from co_sim.core import redis as redis_helpers
+from co_sim.models.session import Session, SessionParticipant, SessionStatus
+from co_sim.schemas.session import SessionCreate, SessionParticipantCreate
+from co_sim.services import activity_stats, session_cache
+from co_sim.services import sessions as session_service
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    await redis_helpers.reset_redis_state()
+    redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
+    await redis_helpers.init_redis(force=True)
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Session.__table__.create(sync_conn))
+        await conn.run_sync(lambda sync_conn: SessionParticipant.__table__.create(sync_conn))
+
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with factory() as session:
+        yield session
+
+    await engine.dispose()
+    await redis_helpers.reset_redis_state()
+
+
+@pytest.mark.asyncio
+async def test_transition_status_by_id_returns_none_for_unknown_session(db_session):
+    assert await session_service.transition_status_by_id(db_session, uuid.uuid4(), SessionStatus.PAUSED) is None
+
+
+@pytest.mark.asyncio
+async def test_transition_status_by_id_updates_row_cache_and_publishes(db_session, monkeypatch):
+    created = await session_service.create_session(db_session, SessionCreate(workspace_id=uuid.uuid4()))
+    user_id = uuid.uuid4()
+    db_obj = await session_service.get_session(db_session, created.id)
+    await session_service.add_participant(db_session, db_obj, SessionParticipantCreate(user_id=user_id, role="owner"))
+
+    published: list[dict] = []
+
+    async def fake_publish(channel: str, message: str) -> int:
+        published.append(orjson.loads(message))
+        return 1
+
+    invalidated: list[uuid.UUID] = []
+    monkeypatch.setattr(session_cache, "publish", fake_publish)
+    monkeypatch.setattr(activity_stats, "invalidate", lambda *ids: invalidated.extend(ids))
+
+    running = await session_service.transition_status_by_id(db_session, created.id, SessionStatus.RUNNING)
+    assert running is not None
+    assert running.status == SessionStatus.RUNNING
+    assert running.started_at is not None and running.ended_at is None
+    assert [participant.user_id for participant in running.participants] == [user_id]
+
+    terminated = await session_service.transition_status_by_id(db_session, created.id, SessionStatus.TERMINATED)
+    assert terminated is not None
+    assert terminated.status == SessionStatus.TERMINATED
+    assert terminated.ended_at is not None
+
+    cached = await session_cache.get_session(created.id)
+    assert cached is not None and cached.status == SessionStatus.TERMINATED
+    redis = await redis_helpers.get_redis()
+    assert not await redis.sismember("sessions:status:running", str(created.id))
+    assert [event["type"] for event in published] == ["session.updated", "session.updated"]
+    assert published[-1]["session"]["status"] == "terminated"
+    assert invalidated == [user_id, user_id]
@@ -2,15 +2,18 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from fakeredis.aioredis import FakeRedis
 from fastapi.testclient import TestClient
 
+from co_sim.agents.simulation.base import SimulationManager
 from co_sim.core import redis as redis_helpers
 
 
-class FakeStreamManager:
+class FakeStreamManager(SimulationManager):
     def __init__(self) -> None:
         self.is_streaming = False
         self._task: asyncio.Task | None = None
@@ -23,11 +26,11 @@ class FakeStreamManager:
         self._frame = 0
         return self.get_state()
 
-    def step(self, actions=None) -> dict[str, float | int]:  # pragma: no cover - not exercised
+    def step(self, actions=None) -> dict[str, float | int]:
         self._frame += 1
         return self.get_state()
 
-    async def start_streaming(self, frame_callback, state_callback=None) -> None:
+    async def start_streaming(self, on_frame) -> None:
         if self.is_streaming:
             return
         self.is_streaming = True
@@ -35,11 +38,7 @@ class FakeStreamManager:
         async def _loop() -> None:
             for _ in range(2):
                 self._frame += 1
-                await frame_callback(f"frame-{self._frame}".encode("utf-8"))
-                if state_callback:
-                    result = state_callback(self.get_state())
-                    if asyncio.iscoroutine(result):
-                        await result
+                await on_frame(f"frame-{self._frame}".encode("utf-8"), self.get_state())
                 await asyncio.sleep(0.01)
 
         self._task = asyncio.create_task(_loop())
@@ -63,25 +62,194 @@ def _fake_redis() -> None:
     asyncio.run(redis_helpers.reset_redis_state())
 
 
-def test_simulation_stream_websocket(_fake_redis, monkeypatch) -> None:
+@pytest.fixture()
+def sim_main(_fake_redis, monkeypatch):
     from co_sim.agents.simulation import main as sim_main
 
     sim_main.simulations.clear()
     monkeypatch.setattr(sim_main, "_create_manager", lambda _: FakeStreamManager())
     monkeypatch.setattr(sim_main.settings, "webrtc_enabled", False)
     monkeypatch.setattr(sim_main.settings, "webrtc_signaling_url", "")
+    yield sim_main
+    sim_main.simulations.clear()
+
+
+def _create_simulation(client: TestClient, session_id: str) -> None:
+    response = client.post(
+        "/simulations/create",
+        json={"session_id": session_id, "engine": "mujoco", "model_path": "/tmp/fake.xml"},
+    )
+    assert response.status_code == 200
 
+
+def test_simulation_stream_websocket(sim_main) -> None:
     with TestClient(sim_main.app) as client:
-        response = client.post(
-            "/simulations/create",
-            json={
-                "session_id": "sim-test",
-                "engine": "mujoco",
-                "model_path": "/tmp/fake.xml",
-            },
-        )
-        assert response.status_code == 200
+        _create_simulation(client, "sim-test")
 
         with client.websocket_connect("/simulations/sim-test/stream") as websocket:
             payload = websocket.receive_bytes()
             assert payload.startswith(b"frame-")
+            websocket.send_text("pause")
+            websocket.send_bytes(b"ping")
+            # Frames queued before the pause may still arrive ahead of the reply.
+            message = websocket.receive()
+            while "text" not in message:
+                message = websocket.receive()
+            assert message["text"] == "pong"
+
+        # The last subscriber leaving records the stop even though no frame follows it.
+        state = client.portal.call(sim_main.simulation_state.get_state, "sim-test")
+        assert state is not None and state.is_streaming is False
+
+
+def test_simulation_stream_websocket_via_redis(sim_main, monkeypatch) -> None:
+    monkeypatch.setattr(sim_main.settings, "multi_process", True)
+
+    with TestClient(sim_main.app) as client:
+        _create_simulation(client, "sim-redis")
+
+        with client.websocket_connect("/simulations/sim-redis/stream") as websocket:
+            payload = websocket.receive_bytes()
+            assert payload.startswith(b"frame-")
+        assert sim_main.simulations["sim-redis"].local_subscribers == []
+
+
+def test_execute_code_captures_output_per_request(sim_main) -> None:
+    with TestClient(sim_main.app) as client:
+        _create_simulation(client, "sim-exec")
+
+        response = client.post(
+            "/simulations/sim-exec/execute",
+            json={"code": "import sys\nprint(sim.step()['frame'])\nprint('oops', file=sys.stderr)"},
+        )
+        body = response.json()
+        assert body["status"] == "success"
+        assert "1\n" in body["stdout"]
+        assert body["stderr"] == "oops\n"
+
+        response = client.post("/simulations/sim-exec/execute", json={"code": "raise ValueError('bad')"})
+        body = response.json()
+        assert body["status"] == "error"
+        assert body["error_type"] == "ValueError"
+
+        client.post("/simulations/sim-exec/execute", json={"code": "counter = 41"})
+        response = client.post("/simulations/sim-exec/execute", json={"code": "print(counter + 1)"})
+        assert "42\n" in response.json()["stdout"]
+
+
+def test_execute_code_runs_sessions_concurrently(sim_main, tmp_path) -> None:
+    # Session A waits for a file only session B creates: a worker-wide lock
+    # around /execute would make A time out before B ever runs.
+    wait_code = (
+        "deadline = time.time() + 5\n"
+        "while time.time() < deadline:\n"
+        "    try:\n"
+        "        with open('go') as handle:\n"
+        "            print(handle.read())\n"
+        "        break\n"
+        "    except FileNotFoundError:\n"
+        "        time.sleep(0.01)\n"
+        "else:\n"
+        "    print('timed out')\n"
+    )
+    with TestClient(sim_main.app) as client:
+        _create_simulation(client, "sim-a")
+        _create_simulation(client, "sim-b")
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            waiting = pool.submit(
+                client.post,
+                "/simulations/sim-a/execute",
+                json={"code": wait_code, "working_dir": str(tmp_path)},
+            )
+            time.sleep(0.2)
+            response = client.post(
+                "/simulations/sim-b/execute",
+                json={"code": "with open('go', 'w') as handle:\n    handle.write('ready')", "working_dir": str(tmp_path)},
+            )
+            assert response.json()["status"] == "success"
+            assert "ready\n" in waiting.result(timeout=10).json()["stdout"]
+
+    assert (tmp_path / "go").read_text() == "ready"
+
+
+def test_control_step_accepts_action_batch(sim_main) -> None:
+    with TestClient(sim_main.app) as client:
+        _create_simulation(client, "sim-batch")
+
+        response = client.post(
+            "/simulations/sim-batch/control",
+            json={"action": "step", "action_batch": [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]]},
+        )
+        assert response.status_code == 200
+        assert response.json()["frame"] == 3
+
+        response = client.post("/simulations/sim-batch/control", json={"action": "step", "actions": [1, 2]})
+        assert response.json()["frame"] == 4
+
+        # Nested action payloads (e.g. per-joint vectors) are still accepted as-is.
+        response = client.post(
+            "/simulations/sim-batch/control", json={"action": "step", "actions": [[1, 2], [3, 4]]}
+        )
+        assert response.status_code == 200
+        assert response.json()["frame"] == 5
+
+
+def test_camera_reports_unsupported_engines(sim_main) -> None:
+    with TestClient(sim_main.app) as client:
+        _create_simulation(client, "sim-camera")
+
+        response = client.post(
+            "/simulations/sim-camera/camera",
+            json={"distance": 2.0, "yaw": 45.0, "pitch": -30.0, "target": [0.0, 0.0, 0.0]},
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "status": "not_supported",
+            "message": "Camera control not supported for this engine",
+        }
+
+
+def test_health_and_active_sessions_payloads(sim_main) -> None:
+    from co_sim.agents.simulation import session_tracker
+
+    with TestClient(sim_main.app) as client:
+        health = client.get("/health").json()
+        assert health["status"] == "healthy"
+        assert health["persisted_simulations"] == 0
+
+        session_tracker.handle_session_event({"session": {"id": "s-1", "status": "running"}})
+        assert client.get("/sessions/active").json() == {"sessions": [{"id": "s-1", "status": "running"}]}
+        session_tracker.handle_session_event({"session": {"id": "s-1", "status": "terminated"}})
+        assert client.get("/sessions/active").json() == {"sessions": []}
+
+
+def test_bounded_io_keeps_latest_output() -> None:
+    from co_sim.agents.simulation.main import BoundedIO
+
+    buffer = BoundedIO(limit=12)
+    for index in range(5):
+        buffer.write(f"line{index}\n")
+    assert buffer.truncated
+    assert buffer.getvalue().endswith("line3\nline4\n")
+    assert len(buffer.getvalue().split("\n", 1)[1]) <= 12
+
+
+def test_thread_capture_delegates_to_real_stream() -> None:
+    import io
+
+    from co_sim.agents.simulation.main import _ThreadCapture
+
+    real = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    capture = _ThreadCapture(real)
+    assert capture.encoding == "utf-8"
+    assert capture.buffer is real.buffer
+    assert capture.isatty() is False
+
+    buffer = io.StringIO()
+    with capture.redirect(buffer):
+        capture.write("captured")
+    capture.write("passthrough")
+    capture.flush()
+    assert buffer.getvalue() == "captured"
+    assert real.buffer.getvalue() == b"passthrough"
@@ -51,20 +51,86 @@ async def test_simulation_persistence_roundtrip():
 
 
 @pytest.mark.asyncio
-async def test_frame_pubsub_roundtrip():
+async def test_frame_stream_roundtrip():
     session_id = "sim-stream"
-    pubsub = await simulation_state.subscribe_frames(session_id)
-
-    try:
-        await simulation_state.publish_frame(session_id, b"frame-data")
-        received = None
-        for _ in range(20):
-            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-            if message and message.get("data"):
-                received = simulation_state.decode_frame_message(message["data"])
-                break
-            await asyncio.sleep(0.05)
-
-        assert received == b"frame-data"
-    finally:
-        await simulation_state.close_frame_subscription(pubsub)
+    last_id = await simulation_state.latest_frame_id(session_id)
+
+    await simulation_state.publish_frame(session_id, b"\xff\xd8frame-1")
+    await simulation_state.publish_frame(session_id, b"\xff\xd8frame-2")
+    frames = await simulation_state.read_frames(session_id, last_id, block_ms=100)
+    assert [frame for _, frame in frames] == [b"\xff\xd8frame-1", b"\xff\xd8frame-2"]
+
+    assert await simulation_state.read_frames(session_id, frames[-1][0], block_ms=10) == []
+    assert await simulation_state.latest_frame_id(session_id) == frames[-1][0]
+
+
+@pytest.mark.asyncio
+async def test_publish_frame_and_state_single_roundtrip():
+    session_id = "sim-pipe"
+    last_id = await simulation_state.latest_frame_id(session_id)
+
+    await simulation_state.publish_frame_and_state(
+        session_id,
+        b"frame-bytes",
+        {"frame": 3, "time": 0.1},
+        status="streaming",
+        streaming=True,
+    )
+    frames = await simulation_state.read_frames(session_id, last_id, block_ms=100)
+    assert [frame for _, frame in frames] == [b"frame-bytes"]
+
+    stored_state = await simulation_state.get_state(session_id)
+    assert stored_state is not None
+    assert stored_state.frame == 3
+    assert stored_state.is_streaming is True
+
+
+@pytest.mark.asyncio
+async def test_frame_subscribers_share_one_reader():
+    session_id = "sim-shared"
+    first = simulation_state.subscribe_frames(session_id)
+    second = simulation_state.subscribe_frames(session_id)
+    reader = simulation_state._frame_readers[session_id]
+    assert reader.queues == {first, second}
+    await asyncio.sleep(0.05)  # let the reader take its starting position
+
+    await simulation_state.publish_frame(session_id, b"\xff\xd8frame-1")
+    assert await asyncio.wait_for(first.get(), 2) == b"\xff\xd8frame-1"
+    assert await asyncio.wait_for(second.get(), 2) == b"\xff\xd8frame-1"
+
+    await simulation_state.unsubscribe_frames(session_id, first)
+    assert not reader.task.done()
+    await simulation_state.unsubscribe_frames(session_id, second)
+    assert reader.task.cancelled()
+    assert session_id not in simulation_state._frame_readers
+
+
+@pytest.mark.asyncio
+async def test_frame_reader_survives_failed_first_read(monkeypatch):
+    session_id = "sim-flaky"
+    real_latest_frame_id = simulation_state.latest_frame_id
+    calls = 0
+
+    async def flaky_latest_frame_id(sid: str) -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ConnectionError("redis unavailable")
+        return await real_latest_frame_id(sid)
+
+    monkeypatch.setattr(simulation_state, "latest_frame_id", flaky_latest_frame_id)
+    queue = simulation_state.subscribe_frames(session_id)
+    reader = simulation_state._frame_readers[session_id]
+    for _ in range(60):  # the reader retries after its back-off
+        if calls >= 2:
+            break
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.05)
+
+    assert not reader.task.done()
+    await simulation_state.publish_frame(session_id, b"frame-1")
+    assert await asyncio.wait_for(queue.get(), 2) == b"frame-1"
+    await asyncio.sleep(0.05)  # let the reader re-enter its blocking read
+
+    await simulation_state.unsubscribe_frames(session_id, queue)
+    assert session_id not in simulation_state._frame_readers
@@ -72,6 +72,26 @@ async def test_terminal_session_write_and_read():
         await ts.stop()
 
 
+@pytest.mark.asyncio
+async def test_terminal_session_read_waits_for_output():
+    """read() blocks until output is available instead of returning empty."""
+    from co_sim.services.terminal import TerminalSession
+
+    ts = TerminalSession(session_id="s3b", shell="/bin/sh")
+    await ts.start()
+
+    try:
+        # Arithmetic expansion keeps the terminal echo from matching the marker.
+        await ts.write("sleep 0.3; echo delayed_$((40 + 2))\n")
+        output = ""
+        while "delayed_42" not in output:
+            chunk = await asyncio.wait_for(ts.read(), timeout=5.0)
+            assert chunk
+            output += chunk
+    finally:
+        await ts.stop()
+
+
 @pytest.mark.asyncio
 async def test_terminal_session_resize():
     """resize() updates the PTY dimensions without crashing."""
@@ -172,3 +192,45 @@ async def test_terminal_state_removal():
 
     await remove_terminal_state("sess-del")
     assert await get_terminal_state("sess-del") is None
+
+
+# ---------------------------------------------------------------------------
+# WebSocket endpoint
+# ---------------------------------------------------------------------------
+
+def test_terminal_ws_binary_output():
+    """encoding=binary streams raw PTY output as binary frames."""
+    from fastapi.testclient import TestClient
+
+    from co_sim.agents.session_orchestrator import main as orchestrator
+
+    redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
+    with TestClient(orchestrator.create_app()) as client:
+        with client.websocket_connect("/v1/sessions/ws-bin/terminal?encoding=binary") as websocket:
+            websocket.send_json({"type": "command", "data": "echo bin_$((40 + 2))\n"})
+            output = b""
+            while b"bin_42" not in output:
+                output += websocket.receive_bytes()
+
+
+def test_terminal_ws_accepts_binary_control_messages():
+    """Control messages may arrive as binary frames; bad JSON yields an error."""
+    from fastapi.testclient import TestClient
+
+    from co_sim.agents.session_orchestrator import main as orchestrator
+
+    redis_helpers.set_redis_factory(lambda _: FakeRedis(decode_responses=True))
+    with TestClient(orchestrator.create_app()) as client:
+        with client.websocket_connect("/v1/sessions/ws-ctl/terminal") as websocket:
+            websocket.send_text("not json")
+            message = websocket.receive_json()
+            while message["type"] == "output":  # shell prompt may arrive first
+                message = websocket.receive_json()
+            assert message == {"type": "error", "message": "Invalid JSON"}
+
+            websocket.send_bytes(b'{"type": "command", "data": "echo ctl_$((40 + 2))\\n"}')
+            output = ""
+            while "ctl_42" not in output:
+                message = websocket.receive_json()
+                if message["type"] == "output":
+                    output += message["data"]
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from fractions import Fraction
+
+import numpy as np
+import orjson
+import pytest
+from PIL import Image
+from aiortc import RTCPeerConnection
+
+from co_sim.agents.simulation.webrtc import FrameBuffer, WebRTCBroadcaster
+
+
+@pytest.mark.asyncio
+async def test_publish_frame_decodes_png_then_accepts_raw_rgb():
+    broadcaster = WebRTCBroadcaster("ws://signaling.invalid", "room", fps=30)
+    pixels = np.arange(4 * 6 * 3, dtype=np.uint8).reshape(4, 6, 3)
+    encoded = io.BytesIO()
+    Image.fromarray(pixels).save(encoded, format="PNG")
+
+    await broadcaster.publish_frame(encoded.getvalue())
+    frame, sequence = await broadcaster._buffer.next_frame(0)
+    assert np.array_equal(frame, pixels)
+
+    # Once the frame size is known, uncompressed RGB of that size skips PIL.
+    await broadcaster.publish_frame(pixels.tobytes())
+    frame, sequence = await broadcaster._buffer.next_frame(sequence)
+    assert sequence == 2
+    assert np.array_equal(frame, pixels)
+
+
+@pytest.mark.asyncio
+async def test_publish_frame_decodes_off_loop_and_stop_releases_pool():
+    broadcaster = WebRTCBroadcaster("ws://signaling.invalid", "room", fps=30)
+    encoded = io.BytesIO()
+    Image.new("RGB", (8, 8), (10, 20, 30)).save(encoded, format="JPEG")
+
+    await broadcaster.publish_frame(encoded.getvalue())
+    frame, _ = await broadcaster._buffer.next_frame(0)
+    assert frame.shape == (8, 8, 3)
+    assert broadcaster._decode_pool is not None
+
+    await broadcaster.stop()
+    assert broadcaster._decode_pool is None
+
+
+def test_frame_buffer_rotates_preallocated_slots():
+    buffer = FrameBuffer(slots=3)
+    first = buffer.writable_slot(4, 6)
+    assert first.shape == (4, 6, 3)
+    second = buffer.writable_slot(4, 6)
+    third = buffer.writable_slot(4, 6)
+    assert len({id(first), id(second), id(third)}) == 3
+    assert buffer.writable_slot(4, 6) is first
+
+    resized = buffer.writable_slot(8, 8)
+    assert resized.shape == (8, 8, 3)
+
+
+@pytest.mark.asyncio
+async def test_frame_buffer_wakes_every_waiting_reader():
+    buffer = FrameBuffer()
+    readers = [asyncio.create_task(buffer.next_frame(0)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert not any(reader.done() for reader in readers)
+
+    frame = np.zeros((2, 2, 3), dtype=np.uint8)
+    await buffer.update(frame)
+    results = await asyncio.wait_for(asyncio.gather(*readers), 1)
+    assert all(result[0] is frame and result[1] == 1 for result in results)
+
+    # A reader that is behind returns immediately without waiting.
+    assert (await buffer.next_frame(0))[1] == 1
+
+
+@pytest.mark.asyncio
+async def test_signaling_sends_text_json():
+    sent: list[object] = []
+
+    class FakeSocket:
+        async def send(self, message: object) -> None:
+            sent.append(message)
+
+    broadcaster = WebRTCBroadcaster("ws://signaling.invalid", "room-1", fps=30)
+    broadcaster._socket = FakeSocket()
+    await broadcaster._handle_signal(orjson.loads('{"type": "welcome", "clientId": "c-1"}'))
+
+    assert broadcaster._client_id == "c-1"
+    assert sent == ['{"type":"join","roomId":"room-1","role":"broadcaster"}']
+
+
+@pytest.mark.asyncio
+async def test_relayed_peers_share_one_source_frame():
+    broadcaster = WebRTCBroadcaster("ws://signaling.invalid", "room", fps=30)
+    first = broadcaster._relay.subscribe(broadcaster._source_track, buffered=False)
+    second = broadcaster._relay.subscribe(broadcaster._source_track, buffered=False)
+
+    await broadcaster.publish_pixels(np.zeros((4, 6, 3), dtype=np.uint8))
+    frames = await asyncio.wait_for(asyncio.gather(first.recv(), second.recv()), 2)
+
+    assert frames[0] is frames[1]
+    assert (frames[0].width, frames[0].height) == (6, 4)
+    assert frames[0].format.name == "yuv420p"
+    relay = broadcaster._relay
+    first.stop()
+    second.stop()
+    await broadcaster.stop()
+    await asyncio.sleep(0)  # let the relay's reader see the end of the source
+    assert not relay._MediaRelay__tasks
+
+
+def test_nvenc_encoder_falls_back_to_software(monkeypatch):
+    from aiortc import rtcrtpsender
+    from av import VideoFrame
+
+    from co_sim.agents.simulation import webrtc
+
+    monkeypatch.setattr(webrtc, "_nvenc_unavailable", False)
+    monkeypatch.setattr(webrtc, "_nvenc_opened", False)
+    monkeypatch.setattr(rtcrtpsender, "get_encoder", rtcrtpsender.get_encoder)
+    if webrtc.use_hardware_encoder():
+        pytest.skip("a GPU encoder is available on this host")
+    assert rtcrtpsender.get_encoder is not webrtc._get_encoder
+
+    encoder = webrtc.NvencH264Encoder()
+    frame = VideoFrame.from_ndarray(np.zeros((64, 64, 3), dtype=np.uint8), format="rgb24")
+    frame.pts = 0
+    frame.time_base = Fraction(1, 30)
+    payloads, _ = encoder.encode(frame)
+    assert payloads
+    assert encoder.codec.name == "libx264"
+
+
+def test_nvenc_open_failure_latches_only_without_a_device(monkeypatch):
+    from co_sim.agents.simulation import webrtc
+
+    monkeypatch.setattr(webrtc, "_nvenc_unavailable", False)
+    monkeypatch.setattr(webrtc, "_nvenc_opened", True)
+    codec = webrtc._open_nvenc(64, 64, 1_000_000)
+    if codec is not None:
+        pytest.skip("a GPU encoder is available on this host")
+    # After a successful open, a failure is treated as transient (session limit).
+    assert webrtc._nvenc_unavailable is False
+
+    monkeypatch.setattr(webrtc, "_nvenc_opened", False)
+    assert webrtc._open_nvenc(64, 64, 1_000_000) is None
+    assert webrtc._nvenc_unavailable is True
+
+
+@pytest.mark.asyncio
+async def test_publish_scales_to_target_size():
+    broadcaster = WebRTCBroadcaster("ws://signaling.invalid", "room", fps=30, target_size=(4, 2))
+
+    await broadcaster.publish_pixels(np.full((8, 16, 3), 200, dtype=np.uint8))
+    frame, sequence = await broadcaster._buffer.next_frame(0)
+    assert frame.shape == (2, 4, 3)
+    assert int(frame[0, 0, 0]) == 200
+
+    pixels = np.zeros((2, 4, 3), dtype=np.uint8)
+    await broadcaster.publish_pixels(pixels)
+    frame, _ = await broadcaster._buffer.next_frame(sequence)
+    assert frame is pixels
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_signal_consumer_survives_handler_errors_and_stops():
+    broadcaster = WebRTCBroadcaster("ws://signaling.invalid", "room-1", fps=30)
+    handled: list[str] = []
+
+    async def handle(payload: dict) -> None:
+        if payload["type"] == "bad":
+            raise RuntimeError("boom")
+        handled.append(payload["type"])
+
+    broadcaster._handle_signal = handle
+    consumer = asyncio.create_task(broadcaster._consume_signals())
+    broadcaster._consumer_task = consumer
+    await broadcaster._signal_queue.put({"type": "bad"})
+    await broadcaster._signal_queue.put({"type": "welcome"})
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    assert handled == ["welcome"]
+    await broadcaster.stop()
+    assert consumer.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_answer_pins_h264_when_offered():
+    sent: list[dict] = []
+    broadcaster = WebRTCBroadcaster("ws://signaling.invalid", "room-1", fps=30)
+
+    async def capture(message: dict) -> None:
+        sent.append(message)
+
+    broadcaster._send = capture
+    viewer = RTCPeerConnection()
+    viewer.addTransceiver("video", direction="recvonly")
+    await viewer.setLocalDescription(await viewer.createOffer())
+    offer = {"type": viewer.localDescription.type, "sdp": viewer.localDescription.sdp}
+    assert "VP8/90000" in offer["sdp"]
+
+    try:
+        await broadcaster._handle_signal({"type": "offer", "fromId": "peer-1", "offer": offer})
+        answer_sdp = sent[-1]["answer"]["sdp"]
+        assert "H264/90000" in answer_sdp
+        assert "VP8/90000" not in answer_sdp
+    finally:
+        await viewer.close()
+        await broadcaster.stop()
+        # Let the peer connections' cancelled ICE tasks unwind.
+        await asyncio.sleep(0.1)
@@ -113,6 +113,20 @@ async def test_list_workspace_files_ordered(db_session: AsyncSession):
     assert paths == ["a.py", "m.py", "z.py"]
 
 
+@pytest.mark.asyncio
+async def test_list_workspace_files_without_content(db_session: AsyncSession):
+    """Tree listings leave file content unloaded."""
+    await wf_service.upsert_workspace_file(
+        db_session, WS_ID, WorkspaceFileUpsert(path="big.py", content="x" * 4096, language="python")
+    )
+    db_session.expunge_all()
+
+    files = await wf_service.list_workspace_files(db_session, WS_ID, include_content=False)
+
+    assert [f.path for f in files] == ["big.py"]
+    assert "content" not in files[0].model_dump()
+
+
 @pytest.mark.asyncio
 async def test_get_workspace_file(db_session: AsyncSession):
     """get_workspace_file returns the file or None."""
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import subprocess
+
+import pytest
+
+from co_sim.services import workspace_git
+
+
+@pytest.mark.asyncio
+async def test_git_diff_stream_matches_buffered_diff(tmp_path, monkeypatch):
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    target = tmp_path / "main.py"
+    target.write_text("print('a')\n")
+    subprocess.run(["git", "add", "main.py"], cwd=tmp_path, check=True)
+    target.write_text("".join(f"print({i})\n" for i in range(20000)))
+
+    async def fake_ensure_repo(session, workspace_id):  # noqa: ANN001
+        return tmp_path
+
+    monkeypatch.setattr(workspace_git, "ensure_repo", fake_ensure_repo)
+
+    chunks = [chunk async for chunk in await workspace_git.git_diff_stream(None, "ws")]
+    buffered = await workspace_git.git_diff(None, "ws")
+
+    assert len(chunks) > 1
+    assert b"".join(chunks).decode() == buffered
@@ -112,7 +112,8 @@ export const Terminal = ({ sessionId, token, onCommand, height = '300px', execut
         .replace('http://', 'ws://')
         .replace('https://', 'wss://');
       
-      const ws = new WebSocket(`${wsUrl}/v1/sessions/${sessionId}/terminal?token=${token}`);
+      const ws = new WebSocket(`${wsUrl}/v1/sessions/${sessionId}/terminal?token=${token}&encoding=binary`);
+      ws.binaryType = 'arraybuffer';
       
       ws.onopen = () => {
         setIsConnected(true);
@@ -132,6 +133,11 @@ export const Terminal = ({ sessionId, token, onCommand, height = '300px', execut
       };
 
       ws.onmessage = (event) => {
+        // Binary frames carry raw PTY output
+        if (event.data instanceof ArrayBuffer) {
+          xterm.write(new Uint8Array(event.data));
+          return;
+        }
         try {
           const data = JSON.parse(event.data);
           